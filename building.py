@@ -0,0 +1,208 @@
+# building.py
+from typing import NamedTuple
+
+try:
+    from interning import MEMBERS, entry_key
+    from rollup import bar_table, reduce_bars, rollup
+except:
+    from modules.Estimate.interning import MEMBERS, entry_key
+    from modules.Estimate.rollup import bar_table, reduce_bars, rollup
+
+
+def merge(first:dict=None, second:dict=None, sign:int=1):
+    ''' Per key sum (or difference) of two {key: value} dicts, keys that cancel out are dropped.'''
+    merged = dict(first)
+    for key, value in second.items():
+        merged[key] = merged.get(key, 0) + sign * value
+        if abs(merged[key]) < 1e-9:
+            del merged[key]
+    return merged
+
+
+class Quantities(NamedTuple):
+    ''' Additive quantities of a set of members in SI units.
+        concrete is the dry volume in m3 per concrete type,
+        bars is a reduce_bars (sizes, categories) array of bar length in m.
+    '''
+    dry_volume:float = 0
+    wall_area:float = 0
+    bars:object = 0
+    formwork:float = 0
+    concrete:dict = {}
+
+    def __add__(self, other):
+        return Quantities(self.dry_volume + other.dry_volume, self.wall_area + other.wall_area, self.bars + other.bars,
+                          self.formwork + other.formwork, merge(self.concrete, other.concrete))
+
+    def __sub__(self, other):
+        return Quantities(self.dry_volume - other.dry_volume, self.wall_area - other.wall_area, self.bars - other.bars,
+                          self.formwork - other.formwork, merge(self.concrete, other.concrete, -1))
+
+    def summary(self):
+        return {
+            "dry_volume": {"value": round(self.dry_volume, 3), "unit": 'm3'},
+            "concrete": { ctype: {"value": round(volume, 3), "unit": 'm3'} for ctype, volume in sorted(self.concrete.items()) },
+            "formwork": {"value": round(self.formwork, 3), "unit": 'm2'},
+            "wall_area": {"value": round(self.wall_area, 3), "unit": 'm2'},
+            "rebars": rollup(totals=self.bars)['total'] if hasattr(self.bars, 'shape') else None
+        }
+
+
+def member_quantities(member):
+    ''' Quantities of one built member.'''
+    dry_volume = getattr(member, 'dry_volume', 0)
+    return Quantities(
+        dry_volume,
+        getattr(member, 'net_area', 0),
+        reduce_bars( *bar_table([member]) ),
+        getattr(member, 'formwork_area', 0),
+        { member.concrete_type: dry_volume } if dry_volume else {}
+    )
+
+
+def entry_tag(entry:tuple=None):
+    kind, data = entry
+    return data.get('id') or data.get('tag')
+
+
+class Level:
+    ''' A storey of a building. It either lists its own (kind, data) member entries
+        or repeats another level, with override entries replacing base members of
+        the same tag (or adding new ones) and removed tags left out.
+        Member tags are unique within a level, Building.add_level rejects repeats.
+    '''
+    def __init__(self, name:str=None, members:list=None, repeat:str=None, overrides:list=None, removed:list=None):
+        self.name = name
+        self.members = members or []
+        self.repeat = repeat
+        self.overrides = overrides or []
+        self.removed = removed or []
+
+
+class Building:
+    ''' Multi storey estimate built from levels. Member quantities are computed once
+        per distinct spec, a repeated level costs its base level's cached quantities
+        plus the deltas of its overrides.
+    '''
+    def __init__(self, name:str=None, levels:list=None):
+        self.name = name
+        self.levels = {}
+        self.members = {} # Quantities per distinct member entry
+        self.totals = {} # Quantities per level
+        self.computed = 0
+        for level in levels or []:
+            self.add_level(level)
+
+    def add_level(self, level:Level=None):
+        ''' Adds or replaces a level, raises ValueError when a tag names two of its members or overrides.'''
+        for entries in (level.members, level.overrides):
+            tags = set()
+            for entry in entries:
+                tag = entry_tag(entry)
+                if tag in tags:
+                    raise ValueError(f"Duplicate member tag {tag!r} on level {level.name!r}")
+                tags.add(tag)
+        self.levels[level.name] = level
+        self.totals.clear()
+
+    def remove_level(self, name:str=None):
+        del self.levels[name]
+        self.totals.clear()
+
+    def member_quantities(self, entry:tuple=None):
+        kind, data = entry
+        key = entry_key(kind, data)
+        quantities = self.members.get(key)
+        if quantities is None:
+            self.computed += 1
+            quantities = self.members[key] = member_quantities(MEMBERS[kind](data))
+        return quantities
+
+    def entries(self, name:str=None):
+        ''' Resolved member entries of a level with its repeats and overrides applied.'''
+        level = self.levels[name]
+        if level.repeat is None:
+            return list(level.members)
+        entries = { entry_tag(entry): entry for entry in self.entries(level.repeat) }
+        for tag in level.removed:
+            entries.pop(tag, None)
+        for entry in level.overrides:
+            entries[entry_tag(entry)] = entry
+        return list(entries.values())
+
+    def quantities(self, name:str=None):
+        ''' Quantities of one level, repeats start from the base level total.'''
+        totals = self.totals.get(name)
+        if totals is not None:
+            return totals
+        level = self.levels[name]
+        if level.repeat is None:
+            totals = Quantities()
+            for entry in level.members:
+                totals = totals + self.member_quantities(entry)
+        else:
+            totals = self.quantities(level.repeat)
+            base = { entry_tag(entry): entry for entry in self.entries(level.repeat) }
+            for tag in level.removed:
+                if tag in base:
+                    totals = totals - self.member_quantities(base.pop(tag))
+            for entry in level.overrides:
+                tag = entry_tag(entry)
+                if tag in base:
+                    totals = totals - self.member_quantities(base[tag])
+                totals = totals + self.member_quantities(entry)
+        self.totals[name] = totals
+        return totals
+
+    @property
+    def takeoff(self):
+        ''' Quantities per level and for the whole building.'''
+        levels = { name: self.quantities(name) for name in self.levels }
+        total = Quantities()
+        for quantities in levels.values():
+            total = total + quantities
+        return {
+            "levels": { name: quantities.summary() for name, quantities in levels.items() },
+            "total": total.summary(),
+            "members_computed": self.computed
+        }
+
+
+def bench_building(storeys:int=30):
+    import time
+
+    def column(tag, width=.4):
+        cdata = dict(id=tag, height=3.0, width=width, bredth=.45, amt=1, unit='m', ctype='m20')
+        cdata['rebars'] = {
+            "main": {"type": "m16", "unit": "m", "length": 3.0, "amt": 4},
+            "stirup": {"type": "m10", "spacing": 0.2, "clm_width": width, "clm_bredth": .45, "clm_height": 3.0, "unit": "m"}
+        }
+        return ('column', cdata)
+
+    def slab(tag, length=6.0):
+        sdata = dict(id=tag, width=4.0, depth=0.15, length=length, span=0.25, unit='m', ctype='m25')
+        sdata['rebars'] = {
+            "main": {"type": "m12", "unit": "m", "length": 4.0, "amt": 30},
+            "dist": {"type": "m10", "unit": "m", "length": length, "amt": 20},
+            "omain": {"type": "m12", "unit": "m", "spacing": 0.2},
+            "odist": {"type": "m10", "unit": "m", "spacing": 0.3}
+        }
+        return ('slab', sdata)
+
+    floor = [ column(f"C{i}", .4 + (i % 3) * .05) for i in range(60) ] + [ slab(f"S{i}", 5.0 + i % 4) for i in range(24) ]
+    levels = [ Level('L1', floor) ]
+    levels += [ Level(f"L{n}", repeat='L1', overrides=[column('C0', .6)] if n % 5 == 0 else None) for n in range(2, storeys + 1) ]
+    start = time.perf_counter()
+    for level in levels:
+        for kind, data in (level.members or floor):
+            member = MEMBERS[kind](data)
+            member.dry_volume, member.bar_groups()
+    naive = time.perf_counter() - start
+    start = time.perf_counter()
+    takeoff = Building('block', levels).takeoff
+    print(f"{storeys} storeys: every member {naive:.3f}s building {time.perf_counter() - start:.3f}s, "
+          f"{takeoff['members_computed']} members computed, {takeoff['total']['dry_volume']}")
+
+
+if __name__ == '__main__':
+    bench_building()
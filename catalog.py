@@ -0,0 +1,215 @@
+# catalog.py
+import functools
+from types import MappingProxyType
+from typing import NamedTuple
+
+try:
+    from elibrary import Library, freeze
+except:
+    from modules.Estimate.elibrary import Library, freeze
+
+
+class BarSpec(NamedTuple):
+    ''' Flat per bar properties used by the rebar takeoffs. '''
+    type:str
+    insize:str
+    kg_per_m:float
+    lb_per_ft:float
+    length_m:float
+    length_ft:float
+    diameter_m:float
+    diameter_in:float
+    id:int = 0
+    size:str = None
+    area_m2:float = 0
+    mill_m:tuple = ()
+    mill_ft:tuple = ()
+
+    def system(self, unit:str=None):
+        ''' Returns (stock bar length, weight per unit length, weight unit)
+            for a measurement unit.
+        '''
+        if unit == 'm':
+            return self.length_m, self.kg_per_m, 'kg'
+        return self.length_ft, self.lb_per_ft, 'lb'
+
+    @property
+    def label(self):
+        ''' Bar type with its imperial size for reports, e.g. m12 ( 1/2inch ).'''
+        return f"{self.type} ( {self.insize}inch )" if self.insize else self.type
+
+
+class Catalog:
+    ''' Process wide read only view of the Library reference data.
+        Sections are frozen on first access and shared by every member object.
+    '''
+
+    @functools.cached_property
+    def rebarnotes(self):
+        return freeze(Library.rebarnotes)
+
+    @functools.cached_property
+    def concrete_types(self):
+        return freeze(Library.concrete_types)
+
+    @functools.cached_property
+    def cmulib(self):
+        return freeze(Library.cmulib)
+
+    @functools.cached_property
+    def structuralnotes(self):
+        return freeze(Library.structuralnotes)
+
+    @functools.cached_property
+    def soilnotes(self):
+        return freeze(Library.soilnotes)
+
+    @functools.cached_property
+    def bars(self):
+        ''' BarSpec tuples keyed by bar type, ids follow the rebarnotes order. '''
+        return MappingProxyType({
+            key: BarSpec(
+                type=key,
+                insize=note.get('insize'),
+                kg_per_m=note.get('weight').get('metric').get('value'),
+                lb_per_ft=note.get('weight').get('imperial').get('value'),
+                length_m=note.get('standard_length').get('metric').get('value'),
+                length_ft=note.get('standard_length').get('imperial').get('value'),
+                diameter_m=note.get('diameter').get('metric').get('value'),
+                diameter_in=note.get('diameter').get('imperial').get('value'),
+                id=i,
+                size=note.get('size'),
+                area_m2=note.get('area').get('metric').get('value'),
+                mill_m=tuple(note.get('mill_lengths').get('metric').get('value')),
+                mill_ft=tuple(note.get('mill_lengths').get('imperial').get('value')),
+            ) for i, (key, note) in enumerate(self.rebarnotes.items())
+        })
+
+    @functools.cached_property
+    def bar_ids(self):
+        ''' Bar id for every name a bar goes by: metric type, imperial inch size and #size. '''
+        ids = {}
+        for spec in self.bars.values():
+            for name in (spec.size, spec.insize, spec.type):
+                if name:
+                    ids[name] = spec.id
+        return MappingProxyType(ids)
+
+    @functools.cached_property
+    def bar_arrays(self):
+        ''' Read only arrays of bar properties indexed by bar id, plus 'imperial'
+            and 'metric', the id of the matching bar in the other system by nearest diameter.
+        '''
+        import numpy as np
+        specs = list(self.bars.values())
+        arrays = {
+            field: np.array([ getattr(spec, field) for spec in specs ], dtype=float)
+            for field in ('kg_per_m', 'lb_per_ft', 'length_m', 'length_ft', 'diameter_m', 'diameter_in', 'area_m2')
+        }
+        imperial = np.array([ spec.id for spec in specs if spec.insize ])
+        nearest = np.abs(arrays['diameter_m'][:, None] - arrays['diameter_m'][None, imperial]).argmin(axis=1)
+        arrays['imperial'] = imperial[nearest]
+        arrays['metric'] = np.arange(len(specs))
+        for array in arrays.values():
+            array.setflags(write=False)
+        return MappingProxyType(arrays)
+
+    def bar(self, bar_type:str=None):
+        ''' BarSpec of a bar by any of its names. '''
+        spec = self.bars.get(bar_type)
+        if spec is None and bar_type in self.bar_ids:
+            return self.specs[self.bar_ids[bar_type]]
+        return spec
+
+    @functools.cached_property
+    def specs(self):
+        ''' BarSpec tuples indexed by bar id. '''
+        return tuple(self.bars.values())
+
+    def bar_id(self, bar_type:str=None):
+        ''' Dense id of a bar by any of its names, raises ValueError for an unknown bar. '''
+        try:
+            return self.bar_ids[bar_type]
+        except KeyError:
+            raise ValueError(f"Unknown bar {bar_type!r}") from None
+
+    def ids(self, types=None):
+        ''' Array of bar ids for a sequence of bar names. '''
+        import numpy as np
+        bar_ids = self.bar_ids
+        try:
+            return np.array([ bar_ids[name] for name in types ], dtype=np.intp)
+        except KeyError as error:
+            raise ValueError(f"Unknown bar {error.args[0]!r}") from None
+
+    @functools.cached_property
+    def bar_conversions(self):
+        ''' Precomputed bar names in the other system: m12 -> 1/2, 1/2 -> m12 and #4 -> m12.
+            Metric bars without an imperial size convert to the nearest one by diameter.
+        '''
+        imperial = self.bar_arrays['imperial']
+        conversions = {}
+        for spec in self.specs:
+            conversions[spec.type] = self.specs[int(imperial[spec.id])].insize
+            for name in (spec.insize, spec.size):
+                if name:
+                    conversions[name] = spec.type
+        return MappingProxyType(conversions)
+
+    def convert_bar(self, bar:str=None):
+        ''' Converts a bar between the metric type and the imperial inch size, raises ValueError for an unknown bar. '''
+        try:
+            return self.bar_conversions[bar]
+        except KeyError:
+            raise ValueError(f"Unknown bar {bar!r}") from None
+
+    @functools.lru_cache(maxsize=8)
+    def units(self, unit:str=None):
+        ''' Frozen unit system for a measurement unit.'''
+        return freeze(Library().set_unit_system(unit))
+
+
+catalog = Catalog()
+
+
+def bench_catalog(reports:int=2000):
+    import time
+    try:
+        from structural import RCColumn
+    except:
+        from modules.Estimate.structural import RCColumn
+
+    def legacy(bar_type):
+        data = Library().rebarnotes.get(bar_type)
+        return (
+            data.get('standard_length').get('metric').get('value'),
+            data.get('weight').get('metric').get('value'),
+            data.get('insize')
+        )
+    # A column report reads the bar data 4 times per bars call and calls bars 6 times per bar group
+    lookups = reports * 2 * 6 * 4
+    start = time.perf_counter()
+    for _ in range(lookups):
+        legacy('m16')
+    before = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(lookups):
+        catalog.bar('m16').system('m')
+    after = time.perf_counter() - start
+    print(f"{lookups} bar lookups: Library() {before:.4f}s catalog {after:.4f}s")
+
+    cdata = dict(id='C121', height=6.8, width=.402, bredth=.45, amt=5, unit='m', ctype='m15')
+    cdata['rebars'] = {
+        "main": {"type": "m16", "unit": "m", "length": 4.5, "amt": 4},
+        "stirup": {"type": "m10", "spacing": 0.25, "clm_width": .402, "clm_bredth": .45,
+                   "clm_height": 6.8, "span": 0.25, "support_spacing": 0.11, "unit": "m"}
+    }
+    # A new member per report so every report is computed, not read from the report cache
+    start = time.perf_counter()
+    for _ in range(reports):
+        RCColumn(data=cdata).report
+    print(f"{reports} column reports: {(time.perf_counter() - start) / reports * 1e6:.1f}us per report")
+
+
+if __name__ == '__main__':
+    bench_catalog()
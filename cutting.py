@@ -0,0 +1,233 @@
+# cutting.py
+import math
+from collections import Counter, defaultdict
+
+try:
+    from catalog import catalog
+    from splice import lap_length, LAP_DIAMETERS
+    from units import SI, factor
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.splice import lap_length, LAP_DIAMETERS
+    from modules.Estimate.units import SI, factor
+
+
+EXACT_LIMIT = 40 # Largest number of cuts per bar size solved exactly in 'exact' mode
+EXACT_NODES = 100_000 # Search budget of one exact packing, the first fit decreasing plan stands when it runs out
+MIN_OFFCUT = 1.0 # Shortest leftover in m worth returning to stock
+
+
+def collect_cuts(members:list=None):
+    ''' Gathers the cut bars of every member of an estimate.
+        Returns {bar type: Counter(cut length in mm: count)}.
+    '''
+    cuts = defaultdict(Counter)
+    for member in members:
+        for group in member.bar_groups():
+            if group.count > 0 and group.length > 0:
+                cuts[group.type][int(round(group.length * 1000))] += int(group.count)
+    return cuts
+
+
+class Bins:
+    ''' Max segment tree over the remaining length of the open stock bars.
+        Finds the first bar a cut fits into in O(log n).
+    '''
+    def __init__(self, capacity:int=None, size:int=1):
+        self.size = 1 << max(1, (size - 1).bit_length())
+        self.tree = [0] * (2 * self.size)
+        self.capacity = capacity
+        self.opened = 0
+
+    def set(self, i:int, remaining:int):
+        node = i + self.size
+        tree = self.tree
+        tree[node] = remaining
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    def first_fit(self, length:int):
+        ''' Index of the first bar with room for length, opening a new bar if none has.'''
+        tree = self.tree
+        if tree[1] < length:
+            self.set(self.opened, self.capacity)
+            self.opened += 1
+        node = 1
+        while node < self.size:
+            node *= 2
+            if tree[node] < length:
+                node += 1
+        return node - self.size
+
+    def place(self, i:int, length:int):
+        self.set(i, self.tree[i + self.size] - length)
+
+
+def first_fit_decreasing(lengths:Counter=None, capacity:int=None):
+    ''' Packs cut lengths (mm: count) into stock bars of capacity mm.
+        Returns the list of cuts held by each bar and the number of cuts
+        placed into the offcut of an already cut bar.
+    '''
+    total = sum(lengths.values())
+    bins = Bins(capacity, total)
+    contents = []
+    reused = 0
+    for length in sorted(lengths, reverse=True):
+        for _ in range(lengths[length]):
+            i = bins.first_fit(length)
+            if i == len(contents):
+                contents.append([])
+            else:
+                reused += 1
+            contents[i].append(length)
+            bins.place(i, length)
+    return contents, reused
+
+
+def exact_pack(lengths:Counter=None, capacity:int=None, upper:int=None, nodes:int=EXACT_NODES):
+    ''' Branch and bound packing with the fewest stock bars, for small sets of cuts.
+        Returns None when no packing beats upper bars or the search visits more than nodes placements.
+    '''
+    cuts = sorted(lengths.elements(), reverse=True)
+    lower = math.ceil(sum(cuts) / capacity)
+    budget = [nodes]
+    for count in range(lower, upper):
+        remaining = [capacity] * count
+        contents = [ [] for _ in range(count) ]
+
+        def place(k:int=0):
+            ''' True when cuts k.. fit, False when they cannot, None when the budget runs out.'''
+            if k == len(cuts):
+                return True
+            budget[0] -= 1
+            if budget[0] < 0:
+                return None
+            tried = set()
+            for i in range(count):
+                if remaining[i] >= cuts[k] and remaining[i] not in tried:
+                    tried.add(remaining[i])
+                    remaining[i] -= cuts[k]
+                    contents[i].append(cuts[k])
+                    placed = place(k + 1)
+                    if placed is not False:
+                        return placed
+                    remaining[i] += cuts[k]
+                    contents[i].pop()
+            return False
+
+        placed = place()
+        if placed:
+            return contents
+        if placed is None:
+            return None
+    return None
+
+
+def pack_size(bar_type:str=None, lengths:Counter=None, stock:float=None, mode:str='ffd',
+              min_offcut:float=MIN_OFFCUT, laps:float=LAP_DIAMETERS):
+    ''' Cutting plan and waste report for one bar size, lengths in mm.'''
+    stock = stock or catalog.bar(bar_type).length_m
+    capacity = int(round(stock * 1000))
+    lap = int(round(lap_length(bar_type, laps) * 1000))
+    full = 0 # runs longer than a stock bar take whole lapped bars, the remainder is packed
+    packable = Counter()
+    for length, count in lengths.items():
+        whole = max(0, -(-(length - capacity) // (capacity - lap)))
+        full += whole * count
+        packable[length - whole * (capacity - lap)] += count
+    contents, reused = first_fit_decreasing(packable, capacity)
+    if mode == 'exact' and sum(packable.values()) <= EXACT_LIMIT and contents:
+        exact = exact_pack(packable, capacity, len(contents))
+        if exact:
+            contents, reused = exact, sum( len(cuts) - 1 for cuts in exact )
+    leftovers = [ capacity - sum(cuts) for cuts in contents ]
+    cut_length = sum( length * count for length, count in lengths.items() ) / 1000
+    bars = full + len(contents)
+    patterns = Counter( tuple(cuts) for cuts in contents )
+    return {
+        "type": bar_type,
+        "stock_length": {"value": stock, "unit": 'm'},
+        "cuts": sum(lengths.values()),
+        "bars": bars,
+        "laps": full,
+        "estimate": round(cut_length / stock),
+        "cut_length": {"value": round(cut_length, 3), "unit": 'm'},
+        "waste": {"value": round(sum(leftovers) / 1000, 3), "unit": 'm'},
+        "waste_pct": round(100 * sum(leftovers) / (bars * capacity), 2) if bars else 0,
+        "offcut_reuse": reused,
+        "offcuts": sum( 1 for leftover in leftovers if leftover >= min_offcut * 1000 ),
+        "weight": {"value": round(bars * stock * catalog.bar(bar_type).kg_per_m, 3), "unit": 'kg'},
+        "patterns": [
+            {"cuts": [ length / 1000 for length in cuts ], "bars": amount}
+            for cuts, amount in patterns.most_common()
+        ]
+    }
+
+
+def mill_lengths(bar_type:str=None, unit:str=SI):
+    ''' Mill lengths in m a bar size is sold in, the imperial ones (BarSpec.mill_ft) for ft projects.
+        Bars without mill lengths come in their standard length.
+    '''
+    bar = catalog.bar(bar_type)
+    if unit == 'ft':
+        return tuple( length * factor('ft', SI) for length in bar.mill_ft ) or (bar.length_ft * factor('ft', SI),)
+    return bar.mill_m or (bar.length_m,)
+
+
+def mill_size(bar_type:str=None, lengths:Counter=None, mode:str='ffd',
+              min_offcut:float=MIN_OFFCUT, laps:float=LAP_DIAMETERS, unit:str=SI):
+    ''' pack_size on the mill length of the bar size that buys the least steel,
+        the shorter bar on a tie.
+    '''
+    plans = [ pack_size(bar_type, lengths, stock, mode, min_offcut, laps) for stock in mill_lengths(bar_type, unit) ]
+    return min(plans, key=lambda plan: (plan['weight']['value'], plan['stock_length']['value']))
+
+
+def optimize(members:list=None, cuts:dict=None, stock:dict=None, mode:str='ffd',
+             min_offcut:float=MIN_OFFCUT, laps:float=LAP_DIAMETERS, mills:bool=True, unit:str=SI):
+    ''' Project wide cutting stock plan.
+        Packs every cut of the members (or a prepared {bar type: Counter(mm: count)})
+        into stock bars per bar size using first fit decreasing,
+        mode 'exact' refines small sets with branch and bound.
+        Each bar size is cut from whichever of its catalog mill lengths buys the
+        least steel, the imperial mill lengths for unit 'ft', or from the standard
+        length when mills is False.
+        stock optionally maps bar types to a fixed stock length in m,
+        runs longer than the stock bar are lapped by laps bar diameters.
+    '''
+    cuts = cuts if cuts is not None else collect_cuts(members)
+    stock = stock or {}
+    return {
+        bar_type: pack_size(bar_type, lengths, stock.get(bar_type), mode, min_offcut, laps)
+        if stock.get(bar_type) or not mills else mill_size(bar_type, lengths, mode, min_offcut, laps, unit)
+        for bar_type, lengths in sorted(cuts.items())
+    }
+
+
+def bench_cutting(cuts:int=50_000):
+    import random, time
+    rng = random.Random(1)
+    lengths = defaultdict(Counter)
+    for _ in range(cuts):
+        lengths[rng.choice(['m10', 'm12', 'm16', 'm20'])][rng.randrange(300, 8800, 5)] += 1
+    start = time.perf_counter()
+    standard = optimize(cuts=lengths, mills=False)
+    elapsed = time.perf_counter() - start
+    plan = optimize(cuts=lengths)
+    for bar_type, size in plan.items():
+        print(f"{bar_type}: {size['cuts']} cuts {size['bars']} x {size['stock_length']['value']}m bars (naive {size['estimate']}) "
+              f"waste {size['waste_pct']}%, {size['weight']['value']}kg against {standard[bar_type]['weight']['value']}kg "
+              f"on {standard[bar_type]['stock_length']['value']}m bars")
+    print(f"{cuts} cuts packed in {elapsed:.2f}s")
+    for size in (10, 25, EXACT_LIMIT):
+        small = Counter( rng.randrange(1500, 5000, 5) for _ in range(size) )
+        start = time.perf_counter()
+        exact = pack_size('m12', small, mode='exact')
+        elapsed = time.perf_counter() - start
+        print(f"exact mode, {size} cuts: {exact['bars']} bars (ffd {pack_size('m12', small)['bars']}) in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    bench_cutting()
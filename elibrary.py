@@ -1,5 +1,56 @@
 # pycal/library.py
 import functools
+import json
+import pickle
+from pathlib import Path
+from types import MappingProxyType
+
+try:
+    from econfig import DATA_PATH
+except:
+    from modules.Estimate.econfig import DATA_PATH
+
+
+LIBRARY_PATH = Path.joinpath(DATA_PATH, 'elibrary')
+
+
+def load_section(name:str=None):
+    ''' Loads one library section from its data file.
+        A precompiled binary cache is used when present and not older than the json source.
+    '''
+    source = Path.joinpath(LIBRARY_PATH, f"{name}.json")
+    cache = Path.joinpath(LIBRARY_PATH, f"{name}.pickle")
+    try:
+        if cache.stat().st_mtime >= source.stat().st_mtime:
+            with open(cache, 'rb') as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    with open(source, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compile_library():
+    ''' Writes the binary cache of every library section for fast warm starts.'''
+    for source in LIBRARY_PATH.glob('*.json'):
+        with open(source, encoding='utf-8') as f:
+            data = json.load(f)
+        with open(source.with_suffix('.pickle'), 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class LibrarySection:
+    ''' Library attribute that loads its section from the data path on first access
+        and then replaces itself on the class with the loaded data.
+    '''
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        data = load_section(self.name)
+        setattr(owner, self.name, data)
+        return data
+
 
 # Construction notes
 class Notes:
@@ -75,1081 +126,65 @@ class Notes:
 
 
 class Library( Notes ):
-    cmulib:dict = {
-        "100": {
-                "type": "cmu-100",
-                "cores": 2,
-                "dimension":{
-                  "thickness": 0.100,
-                  "length": 0.400,
-                  "height": 0.200,
-                  "breadth": 0.100,
-                  "unit": "m"
-
-                }, 
-                "area": {
-                  "value": 0.08,
-                  "unit": "m2"
-                },               
-                "weight": {
-                  "imperial": { "value": 26, "unit": "lb" },
-                  "metric": { "value": 14.5, "unit": "kg" }
-                },
-                "core_volume": {
-                  "imperial": { "value": 0.0847552001, "unit": "ft3" },
-                  "metric": { "value": 0.0024, "unit": "m3" }
-                },
-                "mortar": {
-                  "imperial": { "value": 0, "unit": "ft3" },
-                  "metric": { "value": 0, "unit": "m3" }
-                }
-
-            },
-            "150": {
-                "type": "cmu-150",
-                "cores": 2,
-                "dimension":{
-                  "thickness": 0.150,
-                  "length": 0.400,
-                  "height": 0.200,
-                  "breadth": 0.150,
-                  "unit": "m"
-
-                }, 
-                "area": {
-                  "value": 0.08,
-                  "unit": "m2"
-                },               
-                "weight": {
-                  "imperial": { "value": 32, "unit": "lb" },
-                  "metric": { "value": 0, "unit": "kg" }
-                },
-                "core_volume": {
-                  "imperial": { "value": 0.229545334, "unit": "lb" },
-                  "metric": { "value": 0.0065, "unit": "m3" }
-                },
-                "mortar": {
-                  "imperial": { "value": 0, "unit": "ft3" },
-                  "metric": { "value": 0, "unit": "m3" }
-                }
-
-            },
-            "200": {                
-                "type": "cmu-200",
-                "cores": 2,
-                "dimension":{
-                  "thickness": 0.200,
-                  "length": 0.400,
-                  "height": 0.200,
-                  "breadth": 0.200,
-                  "unit": "m"
-
-                }, 
-                "area": {
-                  "value": 0.08,
-                  "unit": "m2",
-                },               
-                "weight": {
-                  "imperial": { "value": 38, "unit": "lb" },
-                  "metric": { "value": 0, "unit": "kg" }
-                },
-                "core_volume": {
-                  "imperial": { "value": 0.2966432, "unit": "ft3" },
-                  "metric": { "value": 0.0084, "unit": "m3" }
-                },
-                "mortar": {
-                  "imperial": { "value": 0, "unit": "ft3" },
-                  "metric": { "value": 0, "unit": "m3" }
-                }
-                },
-            "250": {
-                "type": "cmu-250",
-                "cores": 2,
-                "dimension":{
-                  "thickness": 0.250,
-                  "length": 0.400,
-                  "height": 0.200,
-                  "breadth": 0.250,
-                  "unit": "m"
-
-                }, 
-                "area": {
-                  "value": 0.08,
-                  "unit": "m2",
-                },               
-                "weight": {
-                  "imperial": { "value": 49, "unit": "lb" },
-                  "metric": { "value": 0, "unit": "kg" }
-                },
-                "core_volume": {
-                  "imperial": { "value": 0.423776, "unit": "ft3" },
-                  "metric": { "value": 0.012, "unit": "m3" }
-                },
-                "mortar": {
-                  "imperial": { "value": 0, "unit": "ft3" },
-                  "metric": { "value": 0, "unit": "m3" }
-                }
-                },
-                "note": """General Cmu Notes"""
-    }
-    sheetrocklib:dict = {
-            "75": {
-                "type": "drywall-75",
-                "thickness": 75,
-                "sheetrock": {
-                "vol": 1,
-                "unit": "mm",
-                "length": 2400,
-                "bredth": 1200,
-                "thickness": 15,
-                "kg": 0,
-                 "lb": 0,
-                "layers": 1,
-                "compound": 1.2,
-                "screws": 36,
-                "tape": 7200
-                },
-                "estimate":{}
+    cmulib:dict = LibrarySection()
+    sheetrocklib:dict = LibrarySection()
+    structuralnotes:dict = LibrarySection()
+    soilnotes:dict = LibrarySection()
+    rebarnotes:dict = LibrarySection()
+    materials:dict = LibrarySection()
+    concrete_types:dict = LibrarySection()
 
-            },
-            "100": {
-                "type": "drywall-100",
-                "thickness": 100,
-                "sheetrock": {
-                "vol": 1,
-                "unit": "mm",
-                "length": 2400,
-                "bredth": 1200,
-                "thickness": 15,
-                "kg": 0,
-                 "lb": 0,
-                "layers": 1,
-                "compound": 1.2,
-                "screws": 36,
-                "tape": 7200
-                },
-                "estimate":{}
-
-            },
-            "150": {
-                "type": "drywall-150",
-                "thickness": 150,
-                "sheetrock": {
-                "vol": 1,
-                "unit": "mm",
-                "length": 2400,
-                "bredth": 1200,
-                "thickness": 15,
-                "kg": 0,
-                 "lb": 0,
-                "layers": 1,
-                "compound": 1.2,
-                "screws": 36,
-                "tape": 7200
-                },
-                "estimate":{}
-
-            },
-
-            "note": """General Sheet Rock  Notes"""
-    }
-    structuralnotes:dict = {
-        "category": "concrete",
-      "title": "Concrete Mix Design",
-      "notes": "Concrete mix design is the process of finding right proportions of cement, sand and aggregates for concrete to achieve target strength in structures. So, concrete mix design can be stated as Concrete Mix = Cement:Sand:Aggregates. Benefits of concrete mix design is that it provides the right proportions of materials, thus making the concrete construction economical in achieving required strength of structural members. As, the quantity of concrete required for large constructions are huge, economy in quantity of materials such as cement makes the project construction economical.",
-      "design_specification": {
-        "curing": {
-          "period": 28,
-          "unit": "days"
-        },
-        "grades": [
-          "M20",
-          "M25",
-          "M30"
-        ]
-      },
-      "grades": {
-        "m20": {
-          "mix_ratio": "",
-          "quality_controll": [
-            "ASTM-",
-            "BSC-",
-            "CIB",
-            "IS:456"
-          ],
-          "exposure": "Mild",
-          "placement_method": "pumpable",
-          "curing": {
-            "period": 28,
-            "unit": "days"
-          },
-          "cement": {
-            "type": "Portland Cement",
-            "quality_controll": [
-              "ASTM-",
-              "BSC-",
-              "CIB",
-              "IS:455"
-            ],
-            "specific_gravity": 3.15
-          },
-          "aggregates": {
-            "nominal": {
-              "type": "crushed stone",
-              "condition": "saturated, surface dry",
-              "shape": "angular",
-              "specific_gravity": 2.84,
-              "quality_controll": [
-                "ASTM-",
-                "BSC-",
-                "CIB",
-                "IS:Z II 383"
-              ],
-              "size": {
-                "d": 20,
-                "unit": "mm"
-              }
-            },
-            "fine": {
-              "quality_controll": [
-                "ASTM-",
-                "BSC-",
-                "CIB",
-                "IS:Z II 383"
-              ],
-              "type": "washed sand",
-              "shape": "n/a",
-              "size": {
-                "d": 0.5,
-                "unit": "mm"
-              },
-              "specific_gravity": 2.64,
-              "condition": "saturated, surface dry"
-            }
-          },
-          "slump": {
-            "min": 50,
-            "max": 75,
-            "unit": "mm"
-          },
-          "mix_procedure": {
-            "quality_controll": [
-              "T1 of IS10262-2009"
-            ],
-            "h_constant": "5%",
-            "risk_factor": 1.65,
-            "standard_deviation": 4,
-            "target_strength": {
-              "formula": "tg = Fck + (Rf * Sd)",
-              "calculation": "ts = 20 + (1.65 * 4)",
-              "value": 26.6,
-              "unit": "N/mm2"
-            },
-            "water_ratio": {
-              "quality_controll": [
-                "ASTM",
-                "BSC",
-                "IS456",
-                "T2 of IS10262-2009"
-              ],
-              "condition": "mild",
-              "max": 0.55,
-              "min": 0.5
-            },
-            "aggregate_content": {
-              "notes": {
-                "n1": "For every ±0.05 change in w/c, the coarse aggregate proportion is to be changed by 0.01. If the w/c is less than 0.5 (standard value), volume of coarse aggregate is required to be increased to reduce the fine aggregate content. If the w/c is more than 0.5, volume of coarse aggregate is to be reduced to increase the fine aggregate content. If coarse aggregate is not angular, volume of coarse aggregate may be required to be increased suitably, based on experience.",
-                "n2": "For pump able concrete or congested reinforcement the coarse aggregate proportion may be reduced up to 10%.",
-                "n3": "Volume of coarse aggregate per unit volume of total aggregate = 0.62 x 90% = 0.558"
-              },
-              "volume": {
-                "formula": "Volume of total aggregates = a – (b + c ) = Volume of Concrete – (0.122 + 0.1916) ",
-                "unit": "m3"
-              },
-              "nominal": {
-                "size": "20mm",
-                "shape": "angular",
-                "volume": {
-                  "formula": "Mass of coarse aggregates = total Volume of Aggreates x 0.558 x 2.84 x 1000",
-                  "unit": "kg/m3"
-                }
-              },
-              "fine": {
-                "size": "0.5mm",
-                "shape": "n/a",
-                "volume": {
-                  "formula": "Volume of fine aggregate = Volume of Concrete  – Volume of Coarse Aggregates",
-                  "unit": "m3"
-                },
-                "mass": {
-                  "formula": "Mass of fine aggregates = total Volume of Aggreates  0.442 x 2.64 x 1000 ",
-                  "unit": "kg/m3"
-                }
-              }
-            },
-            "cement_content": {
-              "note": "Minimum cement Content for mild exposure condition = 260 kg/m3",
-              "volume": {
-                "min": 260,
-                "max": 300,
-                "unit": "kg/m3",
-                "formula": "Volume of cement = (Mass of cement / Specific gravity of cement) x (Volume of Concrete / 100)"
-              },
-              "water_cement_ratio": 0.5,
-              "water_content": {
-                "value": 191.6,
-                "unit": "kg/m3"
-              }
-            },
-            "max_water_content": {
-              "note": "Maximum water content = 186 Kg (for Nominal maximum size of aggregate — 20 mm)",
-              "volume": {
-                "formula": "Volume of water = (Mass of water / Specific gravity of water) x (Volume of Concrete / 1000)",
-                "unit": "m3"
-              }
-            }
-          }
-        },
-        "m25": {
-          "mix_ratio": "",
-          "quality_controll": [
-            "ASTM-",
-            "BSC-",
-            "CIB",
-            "IS:456"
-          ],
-          "exposure": "Mild",
-          "placement_method": "pumpable",
-          "curing": {
-            "period": 28,
-            "unit": "days"
-          },
-          "cement": {
-            "type": "Portland Cement",
-            "quality_controll": [
-              "ASTM-",
-              "BSC-",
-              "CIB",
-              "IS:455"
-            ],
-            "specific_gravity": 3.15
-          },
-          "aggregates": {
-            "nominal": {
-              "type": "crushed stone",
-              "condition": "saturated, surface dry",
-              "shape": "angular",
-              "specific_gravity": 2.84,
-              "quality_controll": [
-                "ASTM-",
-                "BSC-",
-                "CIB",
-                "IS:Z II 383"
-              ],
-              "size": {
-                "d": 20,
-                "unit": "mm"
-              }
-            },
-            "fine": {
-              "quality_controll": [
-                "ASTM-",
-                "BSC-",
-                "CIB",
-                "IS:Z II 383"
-              ],
-              "type": "washed sand",
-              "shape": "n/a",
-              "size": {
-                "d": 0.5,
-                "unit": "mm"
-              },
-              "specific_gravity": 2.64,
-              "condition": "saturated, surface dry"
-            }
-          },
-          "slump": {
-            "min": 50,
-            "max": 75,
-            "unit": "mm"
-          },
-          "mix_procedure": {
-            "quality_controll": [
-              "T1 of IS10262-2009"
-            ],
-            "h_constant": "5%",
-            "risk_factor": 1.65,
-            "standard_deviation": 4,
-            "target_strength": {
-              "formula": "tg = Fck + (Rf * Sd)",
-              "calculation": "ts = 25 + (1.65 * 4)",
-              "value": 31.6,
-              "unit": "N/mm2"
-            },
-            "water_ratio": {
-              "quality_controll": [
-                "ASTM",
-                "BSC",
-                "IS456",
-                "T2 of IS10262-2009"
-              ],
-              "condition": "mild",
-              "max": 0.55,
-              "min": 0.5
-            },
-            "aggregate_content": {
-              "notes": {
-                "n1": "For every ±0.05 change in w/c, the coarse aggregate proportion is to be changed by 0.01. If the w/c is less than 0.5 (standard value), volume of coarse aggregate is required to be increased to reduce the fine aggregate content. If the w/c is more than 0.5, volume of coarse aggregate is to be reduced to increase the fine aggregate content. If coarse aggregate is not angular, volume of coarse aggregate may be required to be increased suitably, based on experience.",
-                "n2": "For pump able concrete or congested reinforcement the coarse aggregate proportion may be reduced up to 10%.",
-                "n3": "Volume of coarse aggregate per unit volume of total aggregate = 0.62 x 90% = 0.558"
-              },
-              "volume": {
-                "formula": "Volume of total aggregates = a – (b + c ) = Volume of Concrete – (0.122 + 0.1916) ",
-                "unit": "m3"
-              },
-              "nominal": {
-                "size": "20mm",
-                "shape": "angular",
-                "volume": {
-                  "formula": "Mass of coarse aggregates = total Volume of Aggreates x 0.558 x 2.84 x 1000",
-                  "unit": "kg/m3"
-                }
-              },
-              "fine": {
-                "size": "0.5mm",
-                "shape": "n/a",
-                "volume": {
-                  "formula": "Volume of fine aggregate = Volume of Concrete  – Volume of Coarse Aggregates",
-                  "unit": "m3"
-                },
-                "mass": {
-                  "formula": "Mass of fine aggregates = total Volume of Aggreates  0.442 x 2.64 x 1000 ",
-                  "unit": "kg/m3"
-                }
-              }
-            },
-            "cement_content": {
-              "note": "Minimum cement Content for mild exposure condition = 300 kg/m3",
-              "volume": {
-                "min": 300,
-                "max": 450,
-                "unit": "kg/m3",
-                "formula": "Volume of cement = (Mass of cement / Specific gravity of cement) x (Volume of Concrete / 100)"
-              },
-              "water_cement_ratio": 0.5,
-              "water_content": {
-                "value": 191.6,
-                "unit": "kg/m3"
-              }
-            },
-            "max_water_content": {
-              "note": "Maximum water content = 186 Kg (for Nominal maximum size of aggregate — 20 mm)",
-              "volume": {
-                "formula": "Volume of water = (Mass of water / Specific gravity of water) x (Volume of Concrete / 1000)",
-                "unit": "m3"
-              }
-            }
-          }
-        },
-        "m30": {
-          "mix_ratio": "",
-          "quality_controll": [
-            "ASTM-",
-            "BSC-",
-            "CIB",
-            "IS:456"
-          ],
-          "exposure": "Mild",
-          "placement_method": "pumpable",
-          "curing": {
-            "period": 28,
-            "unit": "days"
-          },
-          "cement": {
-            "type": "Portland Cement",
-            "quality_controll": [
-              "ASTM-",
-              "BSC-",
-              "CIB",
-              "IS:455"
-            ],
-            "specific_gravity": 3.15
-          },
-          "aggregates": {
-            "nominal": {
-              "type": "crushed stone",
-              "condition": "saturated, surface dry",
-              "shape": "angular",
-              "specific_gravity": 2.84,
-              "quality_controll": [
-                "ASTM-",
-                "BSC-",
-                "CIB",
-                "IS:Z II 383"
-              ],
-              "size": {
-                "d": 20,
-                "unit": "mm"
-              }
-            },
-            "fine": {
-              "quality_controll": [
-                "ASTM-",
-                "BSC-",
-                "CIB",
-                "IS:Z II 383"
-              ],
-              "type": "washed sand",
-              "shape": "n/a",
-              "size": {
-                "d": 0.5,
-                "unit": "mm"
-              },
-              "specific_gravity": 2.64,
-              "condition": "saturated, surface dry"
-            }
-          },
-          "slump": {
-            "min": 50,
-            "max": 75,
-            "unit": "mm"
-          },
-          "mix_procedure": {
-            "quality_controll": [
-              "T1 of IS10262-2009"
-            ],
-            "h_constant": "5%",
-            "risk_factor": 1.65,
-            "standard_deviation": 4,
-            "target_strength": {
-              "formula": "tg = Fck + (Rf * Sd)",
-              "calculation": "ts = 30 + (1.65 * 4)",
-              "value": 36.6,
-              "unit": "N/mm2"
-            },
-            "water_ratio": {
-              "quality_controll": [
-                "ASTM",
-                "BSC",
-                "IS456",
-                "T2 of IS10262-2009"
-              ],
-              "condition": "mild",
-              "max": 0.55,
-              "min": 0.5
-            },
-            "aggregate_content": {
-              "notes": {
-                "n1": "For every ±0.05 change in w/c, the coarse aggregate proportion is to be changed by 0.01. If the w/c is less than 0.5 (standard value), volume of coarse aggregate is required to be increased to reduce the fine aggregate content. If the w/c is more than 0.5, volume of coarse aggregate is to be reduced to increase the fine aggregate content. If coarse aggregate is not angular, volume of coarse aggregate may be required to be increased suitably, based on experience.",
-                "n2": "For pump able concrete or congested reinforcement the coarse aggregate proportion may be reduced up to 10%.",
-                "n3": "Volume of coarse aggregate per unit volume of total aggregate = 0.62 x 90% = 0.558"
-              },
-              "volume": {
-                "formula": "Volume of total aggregates = a – (b + c ) = Volume of Concrete – (0.122 + 0.1916) ",
-                "unit": "m3"
-              },
-              "nominal": {
-                "size": "20mm",
-                "shape": "angular",
-                "volume": {
-                  "formula": "Mass of coarse aggregates = total Volume of Aggreates x 0.558 x 2.84 x 1000",
-                  "unit": "kg/m3"
-                }
-              },
-              "fine": {
-                "size": "0.5mm",
-                "shape": "n/a",
-                "volume": {
-                  "formula": "Volume of fine aggregate = Volume of Concrete  – Volume of Coarse Aggregates",
-                  "unit": "m3"
-                },
-                "mass": {
-                  "formula": "Mass of fine aggregates = total Volume of Aggreates  0.442 x 2.64 x 1000 ",
-                  "unit": "kg/m3"
-                }
-              }
-            },
-            "cement_content": {
-              "note": "Minimum cement Content for mild exposure condition = 300 kg/m3",
-              "volume": {
-                "min": 300,
-                "max": 450,
-                "unit": "kg/m3",
-                "formula": "Volume of cement = (Mass of cement / Specific gravity of cement) x (Volume of Concrete / 100)"
-              },
-              "water_cement_ratio": 0.5,
-              "water_content": {
-                "value": 191.6,
-                "unit": "kg/m3"
-              }
-            },
-            "max_water_content": {
-              "note": "Maximum water content = 186 Kg (for Nominal maximum size of aggregate — 20 mm)",
-              "volume": {
-                "formula": "Volume of water = (Mass of water / Specific gravity of water) x (Volume of Concrete / 1000)",
-                "unit": "m3"
-              }
-            }
-          }
-        }
-      }
-    }
-    soilnotes:dict = {
-      "notes": {
-        "n1": "Bearing capacity of soil is the maximum load per unit area. This is the ultimate bearing capacity of soil shown in table. Dividing the ultimate soil bearing capacity by a safety factor we get the maximum safe bearing capacity of soil for design of foundations.",
-        "n2": "The safe bearing capacity value may be increased by an amount equal to weight of the material removed from above the bearing level that is the base of foundation."
-      },
-      "soil_types": [
-        {
-          "category": "cohesive",
-          "soil": "very-soft-clay",
-          "description": "Very soft clay which can be penetrated several centimeters with the thumb",
-          "bearing_capacity": {
-            "kg": {
-              "value": 0.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 50,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "cohesive",
-          "soil": "soft-clay",
-          "description": "Soft clay indented with moderate thumb pressure",
-          "bearing_capacity": {
-            "kg": {
-              "value": 1,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 100,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "cohesive",
-          "soil": "moist-clay",
-          "description": "Moist clay and sand clay mixture which can be indented with strong thumb pressure",
-          "bearing_capacity": {
-            "kg": {
-              "value": 1.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 150,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "cohesive",
-          "soil": "medium-clay",
-          "description": "Medium clay, readily indented with thumb nail",
-          "bearing_capacity": {
-            "kg": {
-              "value": 2.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 250,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "cohesive",
-          "soil": "soft-shale",
-          "description": "Soft shale, hard or stiff clay in deep bed, dry",
-          "bearing_capacity": {
-            "kg": {
-              "value": 4,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 450,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "cohesive",
-          "soil": "black-cotton",
-          "description": "Black cotton soil",
-          "bearing_capacity": {
-            "kg": {
-              "value": 1.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 150,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "sand-gravel",
-          "description": "Gravel, sand and gravel mixture, compact and offering high resistance to penetration when excavated by tools. (Refer Note 5)",
-          "bearing_capacity": {
-            "kg": {
-              "value": 4.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 450,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "compact-coarse-sand",
-          "description": "Coarse sand, compact and dry (with ground water level at a depth greater than width of foundation below the base of footing)",
-          "bearing_capacity": {
-            "kg": {
-              "value": 4.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 450,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "compact-medium-sand",
-          "description": "Medium sand, compact and dry",
-          "bearing_capacity": {
-            "kg": {
-              "value": 2.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 250,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "medium-clay",
-          "description": "Medium clay, readily indented with thumb nail",
-          "bearing_capacity": {
-            "kg": {
-              "value": 2.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 250,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "fine-dry-silt-sand",
-          "description": "Fine sand, silt (dry lumps easily pulverized by fingers)",
-          "bearing_capacity": {
-            "kg": {
-              "value": 1.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 150,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "loose-sand-gravel",
-          "description": "Loose gravel or sand gravel mixture; loose coarse to medium sand, dry (Refer Note 5)",
-          "bearing_capacity": {
-            "kg": {
-              "value": 2.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 250,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "non-cohesive",
-          "soil": "fine-dry-sand",
-          "description": "Fine sand, loose and dry",
-          "bearing_capacity": {
-            "kg": {
-              "value": 1,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 100,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "rocks",
-          "soil": "hard-granite",
-          "description": "Rocks (hard) without lamination and defects, for example granite, trap and diorite",
-          "bearing_capacity": {
-            "kg": {
-              "value": 33,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 3300,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "rocks",
-          "soil": "stone-limestone",
-          "description": "Laminated rocks, for example sand stone and lime stone in sound condition",
-          "bearing_capacity": {
-            "kg": {
-              "value": 16.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 1650,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "rocks",
-          "soil": "bedrock-shale-cemented",
-          "description": "Residual deposits of shattered and broken bed rock and hard shale, cemented material",
-          "bearing_capacity": {
-            "kg": {
-              "value": 9,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 900,
-              "unit": "kn/m2"
-            }
-          }
-        },
-        {
-          "category": "rocks",
-          "soil": "soft",
-          "description": "Soft rock",
-          "bearing_capacity": {
-            "kg": {
-              "value": 4.5,
-              "unit": "kg/cm2"
-            },
-            "kn": {
-              "value": 450,
-              "unit": "kn/m2"
-            }
-          }
-        }
-      ]
-    }
-    rebarnotes:dict = {
-       "m6": {
-        "size": "#2",
-        "insize": "1/4",
-        "area": {
-          "imperial": {"value": 0.10,"unit": "in2"},
-          "metric": {"value": 0.000064516,"unit": "m2"}
-        },
-        "weight": {
-          "imperial": {"value": 0.334, "unit": "lb/ft"},
-          "metric": {"value": 0.49704675, "unit": "kg/m"}
-        },
-        "diameter": {
-          "imperial": {"value": 0.2500, "unit": "in" },
-          "metric": {"value": 0.00635, "unit": "m"}
-        },
-        "standard_length": {
-          "imperial": {"value": 29.5, "unit": "ft" },
-          "metric": {"value": 9, "unit": "m"}
-        }
-      },
-     
-      "m10": {
-        "size": "#3",
-        "insize": "3/8",
-        "area": {
-          "imperial": {"value": 0.11,"unit": "in2"},
-          "metric": {"value": 7.0968e-5,"unit": "m2"}
-        },
-        "weight": {
-          "imperial": {"value": 0.376, "unit": "lb/ft"},
-          "metric": {"value": 0.55955, "unit": "kg/m"}
-        },
-        "diameter": {
-          "imperial": {"value": 0.375, "unit": "in" },
-          "metric": {"value": 0.009525, "unit": "m"}
-        },
-        "standard_length": {
-          "imperial": {"value": 29.5, "unit": "ft" },
-          "metric": {"value": 9, "unit": "m"}
-        }
-      },
-      "m12": {
-        "size": "#4",
-        "insize": "1/2",
-        "area": {
-          "imperial": {"value": 0.20,"unit": "in2"},
-          "metric": {"value": 0.000129032,"unit": "m2"}
-        },
-        "weight": {
-          "imperial": {"value": 0.668, "unit": "lb/ft"},
-          "metric": {"value": 0.9940935, "unit": "kg/m"}
-        },
-        "diameter": {
-          "imperial": {"value": 0.500, "unit": "in" },
-          "metric": {"value": 0.0127, "unit": "m"}
-        },
-        "standard_length": {
-          "imperial": {"value": 29.5, "unit": "ft" },
-          "metric": {"value": 9, "unit": "m"}
-        }
-      },
-     
-      "m16": {
-        "size": "#5",
-        "insize": "5/8",
-        "area": {
-          "imperial": {"value": 0.31,"unit": "in2"},
-          "metric": {"value": 0.0002,"unit": "m2"}
-        },
-        "weight": {
-          "imperial": {"value": 1.043, "unit": "lb/ft"},
-          "metric": {"value": 1.552155, "unit": "kg/m"}
-        },
-        "diameter": {
-          "imperial": {"value": 0.625, "unit": "in" },
-          "metric": {"value": 0.015875, "unit": "m"}
-        },
-        "standard_length": {
-          "imperial": {"value": 29.5, "unit": "ft" },
-          "metric": {"value": 9, "unit": "m"}
-        }
-      },
-      "m20": {
-        "size": "#6",
-        "insize": "3/4",
-        "area": {
-          "imperial": {"value": 0.44,"unit": "in2"},
-          "metric": {"value": 0.00028387,"unit": "m2"}
-        },
-        "weight": {
-          "imperial": {"value": 1.502, "unit": "lb/ft"},
-          "metric": {"value": 2.2352222, "unit": "kg/m"}
-        },
-        "diameter": {
-          "imperial": {"value": 0.750, "unit": "in" },
-          "metric": {"value": 0.01905, "unit": "m"}
-        },
-        "standard_length": {
-          "imperial": {"value": 29.5, "unit": "ft" },
-          "metric": {"value": 9, "unit": "m"}
-        }
-      },
-    }
-    materials:dict= {
-      "cement": { "density": (1440, 'kg/m3') },
-      "fine_agg": { "density": (1680, 'kg/m3') },
-      "course_agg": { "density": (1540, 'kg/m3') },
-    }
-    concrete_types:dict = {
-       
-       'legend': {'cs': 'Compressive Strength', 'mr': 'Mix Ratio' ,"wet_volume_factor": 1.54, 'bag_weight': (42.5, 'kg')},
-       'm5': {'type': "M5", 'mix_ratio': '1:5:10', 'cs':{'metric': (5, 'MPa'), 'imperial':( 725, 'psi')},
-              'material': {'cement': (137.4912, 'kg/m3'), 'fine_agg': (778.3776, 'kg/m3'), 'course_agg': (1472.625, 'kg/m3')}},
-       'm7.5': {'type': "M7.5", 'mix_ratio': '1:4:8', 'cs':{'metric': (7.5, 'MPa'), 'imperial':( 1087, 'psi')},
-                'material': {'cement': (170.7552, 'kg/m3'), 'fine_agg': (768.3984, 'kg/m3'), 'course_agg': (1449.063, 'kg/m3')}},
-       'm10': {'type': "M10", 'mix_ratio': '1:3:6', 'cs':{'metric': (10, 'MPa'), 'imperial':( 1450, 'psi')},
-               'material': {'cement': (221.76, 'kg/m3'), 'fine_agg': (748.44, 'kg/m3'), 'course_agg': (1413.72, 'kg/m3')}},
-       'm15': {'type': "M15", 'mix_ratio': '1:2:4', 'cs':{'metric': (15, 'MPa'), 'imperial':( 2175, 'psi')},
-               'material': {'cement': (317.1168, 'kg/m3'), 'fine_agg': (713.5128, 'kg/m3'), 'course_agg': (1345.39, 'kg/m3')}},
-       'm20': {'type': "M20", 'mix_ratio': '1:1.5:3', 'cs':{'metric': (20, 'MPa'), 'imperial':( 2900, 'psi')},
-               'material': {'cement': (403.603, 'kg/m3'), 'fine_agg': (681.0804, 'kg/m3'), 'course_agg': (1284.129, 'kg/m3')}},
-       'm25': {'type': "M25", 'mix_ratio': '1:1:2', 'cs':{'metric': (25, 'MPa'), 'imperial':( 3625, 'psi')},
-               'material': {'cement': (554.4, 'kg/m3'), 'fine_agg': (623.7, 'kg/m3'), 'course_agg': (1178.1, 'kg/m3')}},
-       'm30': {'type': "M30", 'mix_ratio': '1:0.75:1.5', 'cs':{'metric': (30, 'MPa'), 'imperial':( 4350, 'psi')},
-               'material': {'cement': (683.0208, 'kg/m3'), 'fine_agg': (576.2988, 'kg/m3'), 'course_agg': (1088.5644, 'kg/m3')}},
-       'm35': {
-          'type': "M35", 'mix_ratio': '1:0.5:1', 
-          'cs':{'metric': (35, 'MPa'), 'imperial':( 5075, 'psi')},
-          'material': {'cement': (887.04, 'kg/m3'), 'fine_agg': (498.96, 'kg/m3'), 'course_agg': (942.48, 'kg/m3')}
-          },
-    }
     def __init__(self, index:str=None):
       if index:        
         self.set_library(index)
     
-    def set_library(self, lib_index:str=None):
-      library_index = {
-        "notes": self.cnote,
-        "rebar": self.rebarnotes,
-        "steel": self.rebarnotes,
-        "soil": self.soilnotes,
-        "earth": self.soilnotes,
-        "dirt": self.soilnotes,
-        "structure": self.structuralnotes,
-        "drywall": self.sheetrocklib,
-        "sheetrock": self.sheetrocklib,
-        "cmu": self.cmulib,
-        "blockwall": self.cmulib,
-        "blocks": self.cmulib,
-
-
-
+    library_index:dict = {
+        "notes": "cnote",
+        "rebar": "rebarnotes",
+        "steel": "rebarnotes",
+        "soil": "soilnotes",
+        "earth": "soilnotes",
+        "dirt": "soilnotes",
+        "structure": "structuralnotes",
+        "drywall": "sheetrocklib",
+        "sheetrock": "sheetrocklib",
+        "cmu": "cmulib",
+        "blockwall": "cmulib",
+        "blocks": "cmulib",
       }
-      self.index = library_index.get(lib_index, lib_index)
 
-    async def get_resource(self, resource:str):
-      try:        
-          ridd = resource.split('-')
-          if len(ridd) == 1:
-            self.set_library(ridd[0])
-            return self.index
-          elif len(ridd) == 2:
-              self.set_library(ridd[0])
-              return self.index.get(ridd[1]) 
-          elif len(ridd) == 3:
-              self.set_library(ridd[0])
-              return self.index.get(ridd[1]).get(ridd[2]) 
-          elif len(ridd) == 4:
-              self.set_library(ridd[0])
-              return self.index.get(ridd[1]).get(ridd[2]).get(ridd[3]) 
-          elif len(ridd) == 5:
-              self.set_library(ridd[0])
-              return self.index.get(ridd[1]).get(ridd[2]).get(ridd[3]).get(ridd[4]) 
+    def section(self, lib_index:str=None):
+      ''' Returns the library section for an index name without changing the instance.'''
+      name = self.library_index.get(lib_index)
+      return getattr(self, name) if name else lib_index
 
+    def set_library(self, lib_index:str=None):
+      self.index = self.section(lib_index)
+
+    async def get_resource(self, resource:str, copy:bool=False):
+      ''' Library data at a '-' separated resource path, see resolve_resource.
+          The result is the shared frozen data (MappingProxyType and tuples) and
+          is read-only, pass copy=True for a plain dict and list copy to mutate
+          or serialise.
+      '''
+      try:
+          node = resolve_resource(resource)
+          return thaw(node) if copy else node
       except:
-          return {"result": "Failed" } 
-    
+          return {"result": "Failed" }
+
+    @staticmethod
+    def resource_cache_info():
+      ''' Hit and miss counters of the shared resource cache.'''
+      return resolve_resource.cache_info()
 
     def convert_bar(self, bar:str=None):
-          converter = {
-              "m6": "1/4",
-              "m10": "3/8",
-              "m12": "1/2",
-              "m16": "5/8",
-              "m20": "3/4",
-              "3/4": "m20",
-              "5/8": "m16",
-              "1/2": "m12",
-              "3/8": "m10",
-              "1/4": "m6"
-          }
-          return converter.get(bar, '1/2')
+          ''' Metric <-> imperial bar name, see Catalog.convert_bar.'''
+          try:
+              from catalog import catalog
+          except:
+              from modules.Estimate.catalog import catalog
+          return catalog.convert_bar(bar)
     
     def set_unit_system(self, unit:str=None):
       if unit:
@@ -1176,6 +211,76 @@ class Library( Notes ):
         return None
 
     
+def freeze(data):
+    ''' Returns a read-only copy of nested library data,
+        dicts become mapping proxies and lists become tuples.
+    '''
+    if isinstance(data, dict):
+        return MappingProxyType({ key: freeze(value) for key, value in data.items() })
+    if isinstance(data, (list, tuple)):
+        return tuple( freeze(value) for value in data )
+    return data
+
+
+def thaw(data):
+    ''' Plain dict and list copy of frozen library data, safe to mutate and serialise.'''
+    if isinstance(data, MappingProxyType):
+        return { key: thaw(value) for key, value in data.items() }
+    if isinstance(data, tuple):
+        return [ thaw(value) for value in data ]
+    return data
+
+
+@functools.lru_cache(maxsize=512)
+def resolve_resource(resource:str):
+    ''' Resolves a '-' separated resource path of any depth
+        e.g. 'structure-grades-m20' or 'soil-soils-0-bearing_capacity'.
+        Holds no per instance state, results are frozen and shared by
+        every caller through a bounded LRU cache.
+    '''
+    keys = resource.split('-')
+    node = Library().section(keys[0])
+    for key in keys[1:]:
+        if isinstance(node, (list, tuple)):
+            node = node[int(key)]
+        else:
+            node = node.get(key)
+    return freeze(node)
+
+
+def bench_library(lookups:int=10_000):
+    import asyncio, subprocess, sys, time
+    for label, code in (
+        ("import", "import elibrary"),
+        ("rebar weights", "import elibrary; elibrary.Library.rebarnotes"),
+        ("all sections", "import elibrary; [ getattr(elibrary.Library, s) for s in ('cmulib', 'sheetrocklib', 'structuralnotes', 'soilnotes', 'rebarnotes', 'materials', 'concrete_types') ]"),
+    ):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, check=True)
+        print(f"{label}: {time.perf_counter() - start:.4f}s")
+    lib = Library()
+    def baseline(resource):
+        # the set_library + index walk get_resource used before the shared cache
+        keys = resource.split('-')
+        lib.set_library(keys[0])
+        node = lib.index
+        for key in keys[1:]:
+            node = node.get(key)
+        return node
+    async def lookup(resource, **kw):
+        for _ in range(lookups):
+            await lib.get_resource(resource, **kw)
+    for resource in ('rebar', 'structure-grades-m20'):
+        start = time.perf_counter()
+        for _ in range(lookups):
+            baseline(resource)
+        line = f"{resource} baseline {(time.perf_counter() - start) / lookups * 1e6:.1f}us"
+        for label, kw in (("frozen", {}), ("copy", {"copy": True})):
+            start = time.perf_counter()
+            asyncio.run(lookup(resource, **kw))
+            line += f" {label} {(time.perf_counter() - start) / lookups * 1e6:.1f}us"
+        print(line)
+
 def test():
   lib = Library()
   print( lib.set_unit_system('mm') )
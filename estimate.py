@@ -6,7 +6,6 @@ import json
 from pathlib import Path
 from estimate_models import EstimateModel
 import datetime
-from tinydb import TinyDB, Query
 
 try: 
     from siteplan.modules.Estimate.econfig import DATA_PATH
@@ -26,6 +25,7 @@ class Estimate:
     def __init__(self, data:dict=None): 
         Estimate.instances += 1      
         #self.conn = Recouch(local_db=self.meta_data.get('database').get('name'))
+        from tinydb import TinyDB # persistence is only loaded when an estimate is opened
         self.db = TinyDB(Path.joinpath(DATA_PATH, "estimate.json"))
         
              
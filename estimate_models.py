@@ -3,8 +3,7 @@ from enum import Enum
 from uuid import UUID, uuid4
 from typing import List
 
-from pydantic import BaseModel, EmailStr
-from httpx import get
+from pydantic import BaseModel
 
 
 class Section(BaseModel):
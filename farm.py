@@ -0,0 +1,79 @@
+# farm.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from interning import MEMBERS
+    from building import Quantities, member_quantities
+except:
+    from modules.Estimate.interning import MEMBERS
+    from modules.Estimate.building import Quantities, member_quantities
+
+
+def partition(entries:list=None, chunks:int=1):
+    ''' Splits member entries into contiguous chunks of near equal size.'''
+    size = -(-len(entries) // max(chunks, 1)) or 1
+    return [ entries[i:i + size] for i in range(0, len(entries), size) ]
+
+
+def report_chunk(entries:list=None):
+    ''' Worker: builds the members of a chunk of (kind, data) entries,
+        returns their reports and the chunk's summed quantities.
+    '''
+    reports = []
+    totals = Quantities()
+    for kind, data in entries:
+        member = MEMBERS[kind](data)
+        reports.append(member.report)
+        totals = totals + member_quantities(member)
+    return reports, totals
+
+
+def merge(results=None):
+    ''' Joins chunk reports in order and sums chunk quantities.'''
+    reports = []
+    totals = Quantities()
+    for chunk, chunk_totals in results:
+        reports.extend(chunk)
+        totals = totals + chunk_totals
+    return reports, totals
+
+
+def farm_reports(entries:list=None, workers:int=None, chunks_per_worker:int=4):
+    ''' Computes the reports of an estimate's (kind, data) member entries in a process pool.
+        Workers receive the plain caller data, never pydantic models, and the chunk
+        totals are merged. workers=1 runs in this process.
+        Returns the reports in entry order and the merged Quantities.
+    '''
+    workers = workers or os.cpu_count() or 1
+    chunks = partition(entries, workers * chunks_per_worker)
+    if workers == 1:
+        results = map(report_chunk, chunks)
+        return merge(results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge(pool.map(report_chunk, chunks))
+
+
+def bench_farm(members:int=20_000, cores:tuple=(1, 2, 4, 8)):
+    import time
+    entries = []
+    for i in range(members):
+        cdata = dict(id=f"C{i}", height=3.0 + (i % 7) * 0.1, width=.4, bredth=.45, amt=1 + i % 3, unit='m', ctype='m20')
+        cdata['rebars'] = {
+            "main": {"type": "m16", "unit": "m", "length": 3.0, "amt": 4},
+            "stirup": {"type": "m10", "spacing": 0.2, "clm_width": .4, "clm_bredth": .45,
+                       "clm_height": cdata['height'], "span": 0.25, "support_spacing": 0.1, "unit": "m"}
+        }
+        entries.append(('column', cdata))
+    print(f"{members} column reports, {os.cpu_count()} cores available")
+    baseline = None
+    for workers in cores:
+        start = time.perf_counter()
+        reports, totals = farm_reports(entries, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers} workers: {elapsed:.2f}s speedup {baseline / elapsed:.2f}x, {totals.summary()['dry_volume']}")
+
+
+if __name__ == '__main__':
+    bench_farm()
@@ -0,0 +1,140 @@
+# finishes.py
+from typing import NamedTuple
+import numpy as np
+
+try:
+    from catalog import catalog
+    from structural import Column
+    from records import ColumnRecord
+    from units import to_si
+    from wallbatch import wall_tables, wall_takeoff
+    from masonry import DRY_FACTOR, CEMENT_DENSITY
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.structural import Column
+    from modules.Estimate.records import ColumnRecord
+    from modules.Estimate.units import to_si
+    from modules.Estimate.wallbatch import wall_tables, wall_takeoff
+    from modules.Estimate.masonry import DRY_FACTOR, CEMENT_DENSITY
+
+
+class Coat(NamedTuple):
+    ''' One coat of a finish, thickness in m and a cement : lime : sand mix by volume.'''
+    name:str
+    thickness:float
+    mix:str
+
+
+# Coats of each finish the wall and column reports measure
+PROFILES:dict = {
+    'rough_cast': (Coat('spatterdash', 0.006, '1:0:2'), Coat('scratch', 0.010, '1:0:4')),
+    'render': (Coat('float', 0.008, '1:1:6'), Coat('finish', 0.003, '1:1:6')),
+}
+WASTE:dict = {'rough_cast': 0.15, 'render': 0.10} # fraction added to the placed volume
+LIME_DENSITY = 640 # kg/m3 hydrated lime
+LIME_BAG = 25 # kg
+
+
+def coefficients(finishes:tuple=None, profiles:dict=None, waste=None):
+    ''' (finishes x 4) array of placed mortar, dry cement, lime and sand in m3 per m2 of each finish.'''
+    rows = []
+    for finish in finishes:
+        extra = 1 + (waste.get(finish, 0) if isinstance(waste, dict) else waste or 0)
+        row = np.zeros(4)
+        for coat in profiles[finish]:
+            parts = np.array([ float(part) for part in coat.mix.split(':') ])
+            row[0] += coat.thickness * extra
+            row[1:] += coat.thickness * extra * DRY_FACTOR * parts / parts.sum()
+        rows.append(row)
+    return np.array(rows).reshape(-1, 4)
+
+
+def finishes_takeoff(areas:dict=None, profiles:dict=PROFILES, waste=WASTE):
+    ''' Batch plaster and render materials.
+        Takes {finish: array of m2 per member} and returns the areas with arrays of
+        placed mortar volume, cement, lime and sand per member, waste included,
+        in one pass.
+    '''
+    finishes = tuple(areas)
+    area = np.column_stack([ np.asarray(areas[finish], dtype=float) for finish in finishes ])
+    materials = area @ coefficients(finishes, profiles, waste)
+    cement = np.round(materials[:, 1] * CEMENT_DENSITY, 3)
+    lime = np.round(materials[:, 2] * LIME_DENSITY, 3)
+    takeoff = { finish: area[:, i] for i, finish in enumerate(finishes) }
+    takeoff.update({
+        "mortar": np.round(materials[:, 0], 4),
+        "cement": cement,
+        "bags": np.ceil(cement / catalog.concrete_types.get('legend').get('bag_weight')[0]).astype(int),
+        "lime": lime,
+        "lime_bags": np.ceil(lime / LIME_BAG).astype(int),
+        "sand": np.round(materials[:, 3], 4)
+    })
+    return takeoff
+
+
+def member_areas(entries:list=None, finishes:tuple=None):
+    ''' Tags and {finish: m2} arrays of the walls and columns of (kind, data) estimate entries.
+        Walls carry their net area on both faces (walls.Wall rough_cast and render),
+        columns their Column.surface times amt.
+    '''
+    walls = [ data for kind, data in entries if kind == 'wall' ]
+    columns = [ data for kind, data in entries if kind == 'column' ]
+    tags, surface = [], []
+    if walls:
+        table, opening_table, _, wall_tags = wall_tables(walls)
+        takeoff = wall_takeoff(table, opening_table)
+        tags += wall_tags
+        surface.append(takeoff['rough_cast'])
+    if columns:
+        records = [ ColumnRecord.from_model(to_si(Column, data, data.get('unit'))) for data in columns ]
+        table = ColumnRecord.table(records)
+        tags += [ record.id for record in records ] # the table's id column is fixed width
+        surface.append(ColumnRecord.geometry(table)['surface'] * table['amt'])
+    surface = np.concatenate(surface) if surface else np.zeros(0)
+    return tags, { finish: surface for finish in finishes }
+
+
+def estimate_finishes(entries:list=None, profiles:dict=PROFILES, waste=WASTE):
+    ''' finishes_takeoff of every wall and column of an estimate.
+        Returns the member tags, the per member takeoff and the estimate totals.
+    '''
+    tags, areas = member_areas(entries, tuple(profiles))
+    takeoff = finishes_takeoff(areas, profiles, waste)
+    totals = { finish: {"value": round(float(takeoff[finish].sum()), 3), "unit": 'm2'} for finish in profiles }
+    totals.update({
+        "mortar": {"value": round(float(takeoff['mortar'].sum()), 3), "unit": 'm3'},
+        "cement": {"value": round(float(takeoff['cement'].sum()), 3), "unit": 'kg',
+                   "bag": {"value": int(takeoff['bags'].sum()), "unit": 'bag'}},
+        "lime": {"value": round(float(takeoff['lime'].sum()), 3), "unit": 'kg',
+                 "bag": {"value": int(takeoff['lime_bags'].sum()), "unit": 'bag'}},
+        "sand": {"value": round(float(takeoff['sand'].sum()), 3), "unit": 'm3'}
+    })
+    return tags, takeoff, totals
+
+
+def bench_finishes(members:int=20_000):
+    import time
+    try:
+        from walls import Wall, data
+    except:
+        from modules.Estimate.walls import Wall, data
+    rng = np.random.default_rng(1)
+    entries = []
+    for i in range(members):
+        if i % 2:
+            entries.append(('wall', dict(data, tag=f"W{i}", length=float(rng.uniform(3, 30)), height=float(rng.uniform(2.4, 4.5)))))
+        else:
+            entries.append(('column', dict(id=f"C{i}", height=3.0, width=float(rng.uniform(.2, .6)), bredth=.45, amt=1 + i % 3, unit='m', ctype='m20')))
+    start = time.perf_counter()
+    for kind, row in entries[:1000]:
+        area = Wall(row).net_area * 2 if kind == 'wall' else to_si(Column, row).surface * row['amt']
+        finishes_takeoff({ finish: [area] for finish in PROFILES })
+    each = (time.perf_counter() - start) * members / 1000
+    start = time.perf_counter()
+    _, _, totals = estimate_finishes(entries)
+    print(f"{members} members: per member {each:.2f}s (estimated) batch {time.perf_counter() - start:.3f}s, "
+          f"{totals['cement']['bag']['value']} cement bags {totals['lime']['bag']['value']} lime bags {totals['sand']['value']}m3 sand")
+
+
+if __name__ == '__main__':
+    bench_finishes()
@@ -0,0 +1,62 @@
+# import_budget.py
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+HOME_PATH = Path(__file__).parent
+
+# Seconds allowed for a cold import of each compute module in a fresh interpreter
+BUDGET:dict = {
+    "econfig": 0.05,
+    "elibrary": 0.1,
+    "catalog": 0.1,
+    "concrete": 0.5,
+    "walls": 0.8,
+    "structural": 1.0,
+}
+
+# Persistence, HTTP and schema libraries the compute modules must not load on import
+DEFERRED:tuple = ("tinydb", "httpx", "schematics", "email_validator")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [ name for name in {deferred!r} if name in sys.modules ]}}))
+"""
+
+
+def measure(module:str=None):
+    ''' Imports a module in a fresh interpreter and returns its import time
+        and any deferred libraries it pulled in.
+    '''
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, deferred=DEFERRED)],
+        cwd=HOME_PATH, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_import_budget(budget:dict=None, runs:int=3):
+    ''' Fails when a compute module imports slower than its budget (best of runs)
+        or loads a deferred library at import time.
+    '''
+    failures = []
+    for module, limit in (budget or BUDGET).items():
+        results = [ measure(module) for _ in range(runs) ]
+        elapsed = min( result.get('elapsed') for result in results )
+        loaded = results[0].get('loaded')
+        print(f"{module}: {elapsed * 1000:.1f}ms (budget {limit * 1000:.0f}ms) {loaded or ''}")
+        if elapsed > limit:
+            failures.append(f"{module} imported in {elapsed:.3f}s, budget {limit}s")
+        if loaded:
+            failures.append(f"{module} loaded {', '.join(loaded)} at import")
+    if failures:
+        raise AssertionError("; ".join(failures))
+
+
+if __name__ == '__main__':
+    check_import_budget()
@@ -0,0 +1,138 @@
+# interning.py
+import json
+from typing import NamedTuple
+
+try:
+    from structural import RCColumn, RCBeam, Foundation, Slab, ConcreteFloor
+    from walls import Wall
+    from rollup import bar_table
+except:
+    from modules.Estimate.structural import RCColumn, RCBeam, Foundation, Slab, ConcreteFloor
+    from modules.Estimate.walls import Wall
+    from modules.Estimate.rollup import bar_table
+
+
+MEMBERS:dict = {
+    'column': RCColumn,
+    'beam': RCBeam,
+    'foundation': Foundation,
+    'slab': Slab,
+    'floor': ConcreteFloor,
+    'wall': Wall
+}
+IDENTITY:tuple = ('id', 'tag') # Fields naming a member rather than describing it
+REFERENCES:tuple = ('wall_tag',) # Fields of nested specs pointing back at their member
+
+
+class Interned(NamedTuple):
+    ''' One unique member spec, its computed member and every tag it stands for.'''
+    member:object
+    count:int
+    tags:tuple
+
+
+def fields(part, skip:tuple=REFERENCES):
+    ''' Hashable (name, value) view of a spec, record or list of them without the skipped fields.'''
+    if isinstance(part, (list, tuple)):
+        return tuple( fields(item, skip) for item in part )
+    if hasattr(part, '__pydantic_fields__'):
+        items = part.__dict__.items()
+    elif hasattr(part, '__slots__') and not hasattr(part, '__dict__'):
+        items = ( (name, getattr(part, name)) for name in part.__slots__ )
+    else:
+        return part
+    return tuple( (name, value) for name, value in items if name not in skip )
+
+
+def spec_key(member, by_unit:bool=False):
+    ''' Key of a member's normalized SI record and specs, without its tag.
+        The caller's unit system only counts with by_unit, for reports presented in it.
+    '''
+    unit = member.unit if by_unit else None
+    return repr((type(member).__name__, unit, fields(member.data, IDENTITY + REFERENCES), fields(member.specs())))
+
+
+def entry_key(kind:str=None, data:dict=None):
+    ''' Key of a raw caller entry without its tag, identical entries are built once.'''
+    return kind + json.dumps({ key: value for key, value in data.items() if key not in IDENTITY }, sort_keys=True, default=str)
+
+
+def intern_members(entries=None, by_unit:bool=False):
+    ''' Deduplicates (kind, data) entries or built members by spec.
+        Identical raw entries are built once, built members with the same SI spec
+        share one Interned entry whatever units they were given in, or only within
+        one unit system with by_unit. Returns the unique specs and the hit statistics.
+    '''
+    built = {}
+    unique = {}
+    members = 0
+    for entry in entries:
+        members += 1
+        if isinstance(entry, tuple):
+            kind, data = entry
+            key = entry_key(kind, data)
+            member = built.get(key)
+            if member is None:
+                member = built[key] = MEMBERS[kind](data)
+            tag = data.get('id') or data.get('tag')
+        else:
+            member = entry
+            tag = getattr(member.data, 'id', None) or getattr(member.data, 'tag', None)
+        key = spec_key(member, by_unit)
+        if key in unique:
+            unique[key][1] += 1
+            unique[key][2].append(tag)
+        else:
+            unique[key] = [member, 1, [tag]]
+    interned = [ Interned(member, count, tuple(tags)) for member, count, tags in unique.values() ]
+    stats = {
+        "members": members,
+        "unique": len(interned),
+        "hit_ratio": round(1 - len(interned) / members, 4) if members else 0
+    }
+    return interned, stats
+
+
+def interned_reports(entries=None):
+    ''' Reports each unique member spec once with the tags and count it stands for,
+        specs given in other unit systems are reported apart in their own units.
+    '''
+    interned, stats = intern_members(entries, by_unit=True)
+    return {
+        "members": [
+            {"tags": spec.tags, "count": spec.count, "report": spec.member.report}
+            for spec in interned
+        ],
+        "dry_volume": {"value": round(sum( getattr(spec.member, 'dry_volume', 0) * spec.count for spec in interned ), 3), "unit": 'm3'},
+        "stats": stats
+    }
+
+
+def interned_bar_table(interned:list=None):
+    ''' rollup.bar_table of the unique members with bar counts multiplied by occurrences.'''
+    return bar_table([ spec.member for spec in interned ], [ spec.count for spec in interned ])
+
+
+def bench_interning(floors:int=20, columns:int=40):
+    import time
+    entries = []
+    for floor in range(floors):
+        for i in range(columns):
+            cdata = dict(id=f"L{floor}-C{i}", height=3.0, width=.4 if i % 4 else .5, bredth=.45, amt=1, unit='m', ctype='m20')
+            cdata['rebars'] = {
+                "main": {"type": "m16", "unit": "m", "length": 3.0, "amt": 4 + (i % 4 == 0) * 4},
+                "stirup": {"type": "m10", "spacing": 0.2, "clm_width": cdata['width'], "clm_bredth": .45,
+                           "clm_height": 3.0, "span": 0.25, "support_spacing": 0.1, "unit": "m"}
+            }
+            entries.append(('column', cdata))
+    start = time.perf_counter()
+    [ RCColumn(data).report for _, data in entries ]
+    naive = time.perf_counter() - start
+    start = time.perf_counter()
+    reports = interned_reports(entries)
+    interned = time.perf_counter() - start
+    print(f"{len(entries)} columns: each {naive:.3f}s interned {interned:.3f}s, {reports['stats']}")
+
+
+if __name__ == '__main__':
+    bench_interning()
@@ -0,0 +1,308 @@
+# ipc.py
+import functools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+import numpy as np
+
+try:
+    from catalog import catalog
+    from structural import Column, Beam, StripFooting, SuspendedSlab, Mainbar, Stirup, Links
+    from farm import partition, report_chunk, merge
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.structural import Column, Beam, StripFooting, SuspendedSlab, Mainbar, Stirup, Links
+    from modules.Estimate.farm import partition, report_chunk, merge
+
+
+# Member model and rebar spec models per caller rebars key, for each member kind with a fixed layout.
+# Walls carry a variable number of openings and travel as plain data.
+LAYOUTS:dict = {
+    'column': (Column, {'main': Mainbar, 'stirup': Stirup}),
+    'beam': (Beam, {'main': Mainbar, 'extra': Mainbar, 'stirup': Stirup}),
+    'foundation': (StripFooting, {'main': Mainbar, 'links': Links}),
+    'slab': (SuspendedSlab, {'main': Mainbar, 'dist': Mainbar, 'omain': Mainbar, 'odist': Mainbar}),
+}
+STRING = 'i4' # string columns hold an index into the table's Strings, -1 for None
+
+
+def is_string(name:str=None, annotation=None):
+    return name != 'type' and annotation in (str, str | None)
+
+
+def field_dtype(name:str=None, annotation=None):
+    ''' Binary column type of a model field, bar types travel as catalog bar ids.'''
+    if name == 'type':
+        return 'i2'
+    if annotation is int:
+        return 'i4'
+    if annotation is float or annotation == (float | None):
+        return 'f8'
+    return STRING
+
+
+# Bar id codes of rebar specs without a bar type
+MISSING, NONE, UNTYPED = -1, -2, -3 # no spec under the key, a None spec, a spec without a type
+
+
+@functools.lru_cache(maxsize=8)
+def layout(kind:str=None):
+    ''' (dtype, columns) of a member kind.
+        Each column is (name, rebars key or None, field, default, string column),
+        the '_absent' column holds one bit per column the caller data left out and
+        '_extra' the json of any caller keys outside the layout.
+    '''
+    model, rebars = LAYOUTS[kind]
+    columns = [ (name, None, name, field) for name, field in model.model_fields.items() ]
+    for key, spec in rebars.items():
+        columns += [ (f"{key}_{name}", key, name, field) for name, field in spec.model_fields.items() ]
+    if len(columns) > 64:
+        raise ValueError(f"{kind} has {len(columns)} columns, the absent mask holds 64")
+    dtype = np.dtype([ (column, field_dtype(name, field.annotation)) for column, _, name, field in columns ] + [('_absent', 'u8'), ('_extra', STRING)])
+    return dtype, tuple(
+        (column, key, name, None if field.is_required() else field.default, is_string(name, field.annotation))
+        for column, key, name, field in columns
+    )
+
+
+class Strings:
+    ''' Interned strings of an encoded table as utf-8 bytes and their offsets,
+        read by index without decoding the rest.
+    '''
+    def __init__(self, offsets=None, blob=None):
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def pack(cls, strings:list=None):
+        data = [ value.encode() for value in strings ]
+        offsets = np.zeros(len(data) + 1, dtype=np.int64)
+        np.cumsum([ len(value) for value in data ], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b''.join(data), dtype=np.uint8).copy())
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i:int):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+
+@functools.lru_cache(maxsize=8)
+def known(kind:str=None):
+    ''' Field names of a member kind and of each of its rebar specs.'''
+    model, specs = LAYOUTS[kind]
+    return frozenset(model.model_fields) | {'rebars'}, { key: frozenset(spec.model_fields) for key, spec in specs.items() }
+
+
+def extras(kind:str=None, data:dict=None):
+    ''' Caller keys of a data dict the layout has no column for, None when there are none.'''
+    fields, specs = known(kind)
+    found = {}
+    top = { key: value for key, value in data.items() if key not in fields }
+    if top:
+        found['data'] = top
+    rebars = {}
+    for key, spec in data['rebars'].items():
+        if key not in specs:
+            rebars[key] = spec
+        elif isinstance(spec, dict):
+            unknown = { name: value for name, value in spec.items() if name not in specs[key] }
+            if unknown:
+                rebars[key] = unknown
+    if rebars:
+        found['rebars'] = rebars
+    return found or None
+
+
+def encode(kind:str=None, entries:list=None):
+    ''' Packs caller data dicts of one member kind into a structured array and its Strings.
+        None becomes nan or a string index of -1, rebar specs without a bar type get
+        a MISSING, NONE or UNTYPED bar id. decode gives back the same dicts.
+    '''
+    dtype, columns = layout(kind)
+    table = np.zeros(len(entries), dtype=dtype)
+    bar_ids = catalog.bar_ids
+    strings = {}
+    absent = np.zeros(len(entries), dtype=np.uint64)
+    for bit, (column, key, name, default, string) in enumerate(columns):
+        values = []
+        missing = []
+        for data in entries:
+            source = data if key is None else data['rebars'].get(key)
+            if name == 'type' and key is not None:
+                value = source.get('type') if isinstance(source, dict) else None
+                value = bar_ids[value] if value else MISSING if key not in data['rebars'] else NONE if source is None else UNTYPED
+                missing.append(value < 0)
+                values.append(value)
+                continue
+            source = source if isinstance(source, dict) else {}
+            missing.append(name not in source)
+            value = source.get(name, default)
+            if string:
+                value = -1 if value is None else strings.setdefault(value, len(strings))
+            elif value is None:
+                value = np.nan
+            values.append(value)
+        table[column] = values
+        absent |= np.array(missing, dtype=np.uint64) << np.uint64(bit)
+    table['_absent'] = absent
+    table['_extra'] = [ -1 if found is None else strings.setdefault(json.dumps(found), len(strings)) for found in map(extras, repeat(kind), entries) ]
+    return table, Strings.pack(list(strings))
+
+
+def decode(kind:str=None, table=None, strings:Strings=None):
+    ''' Yields the caller data dicts of the rows of an encoded table.'''
+    dtype, columns = layout(kind)
+    specs = catalog.specs
+    for row in table.tolist():
+        data = {}
+        rebars = data['rebars'] = {}
+        absent, extra = row[-2:]
+        for bit, (column, value) in enumerate(zip(columns, row)):
+            _, key, name, _, string = column
+            if key is not None and name == 'type':
+                if value != MISSING:
+                    rebars[key] = None if value == NONE else {}
+                if value >= 0:
+                    rebars[key]['type'] = specs[value].type
+                continue
+            if absent >> bit & 1:
+                continue
+            if string:
+                value = None if value < 0 else strings[value]
+            elif value != value:
+                value = None
+            if key is None:
+                data[name] = value
+            elif rebars.get(key) is not None:
+                rebars[key][name] = value
+        if extra >= 0:
+            extra = json.loads(strings[extra])
+            data.update(extra.get('data', {}))
+            for key, spec in extra.get('rebars', {}).items():
+                if isinstance(rebars.get(key), dict):
+                    rebars[key].update(spec)
+                else:
+                    rebars[key] = spec
+        yield data
+
+
+class SharedTables:
+    ''' Encoded member tables of an estimate and their Strings in one shared memory block.
+        Workers attach by name and read their rows without copies or pickles.
+    '''
+    def __init__(self, tables:dict=None):
+        self.layout = {}
+        offset = 0
+        for kind, (table, strings) in tables.items():
+            self.layout[kind] = (offset, len(table), len(strings), strings.blob.nbytes)
+            offset += table.nbytes + strings.offsets.nbytes + strings.blob.nbytes
+        self.memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for kind, (table, strings) in tables.items():
+            shared_table, shared_strings = view(self.memory, kind, *self.layout[kind])
+            shared_table[:] = table
+            shared_strings.offsets[:] = strings.offsets
+            shared_strings.blob[:] = strings.blob
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.memory.close()
+        self.memory.unlink()
+
+
+def view(memory, kind:str=None, offset:int=0, rows:int=0, strings:int=0, size:int=0):
+    ''' The table and Strings of one kind laid out from offset in a shared memory block.'''
+    table = np.ndarray((rows,), dtype=layout(kind)[0], buffer=memory.buf, offset=offset)
+    offset += table.nbytes
+    offsets = np.ndarray((strings + 1,), dtype=np.int64, buffer=memory.buf, offset=offset)
+    blob = np.ndarray((size,), dtype=np.uint8, buffer=memory.buf, offset=offset + offsets.nbytes)
+    return table, Strings(offsets, blob)
+
+
+def shared_chunk(task:tuple=None):
+    ''' Worker: reports of rows start:stop of one member kind read from shared memory.'''
+    name, kind, placement, start, stop = task
+    memory = shared_memory.SharedMemory(name=name)
+    table, strings = view(memory, kind, *placement)
+    try:
+        return report_chunk([ (kind, data) for data in decode(kind, table[start:stop], strings) ])
+    finally:
+        del table, strings # release the buffer before closing the block
+        memory.close()
+
+
+def farm_shared(entries:list=None, workers:int=None, chunks_per_worker:int=4):
+    ''' farm.farm_reports with members shipped as binary tables through shared memory.
+        Walls and other kinds without a fixed layout go to the workers as plain data.
+        Returns the reports in entry order and the merged Quantities.
+    '''
+    workers = workers or os.cpu_count() or 1
+    positions = {}
+    for i, (kind, data) in enumerate(entries):
+        positions.setdefault(kind if kind in LAYOUTS else None, []).append(i)
+    tables = { kind: encode(kind, [ entries[i][1] for i in rows ]) for kind, rows in positions.items() if kind }
+    chunks = max(workers * chunks_per_worker // max(len(positions), 1), 1)
+    order = []
+    with SharedTables(tables) as shared, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for kind, rows in positions.items():
+            if kind is None:
+                for part in partition(rows, chunks):
+                    futures.append(pool.submit(report_chunk, [ entries[i] for i in part ]))
+                    order.append(part)
+                continue
+            placement = shared.layout[kind]
+            for part in partition(list(range(len(rows))), chunks):
+                futures.append(pool.submit(shared_chunk, (shared.memory.name, kind, placement, part[0], part[-1] + 1)))
+                order.append([ rows[i] for i in part ])
+        reports, totals = merge( future.result() for future in futures )
+    ordered = [None] * len(entries)
+    for position, report in zip(( i for part in order for i in part ), reports):
+        ordered[position] = report
+    return ordered, totals
+
+
+def bench_ipc(members:int=20_000):
+    import pickle, time
+    rows = []
+    for i in range(members):
+        cdata = dict(id=f"C{i}", height=3.0 + (i % 7) * 0.1, width=.4, bredth=.45, amt=1, unit='m', ctype='m20')
+        cdata['rebars'] = {
+            "main": {"type": "m16", "unit": "m", "length": 3.0, "amt": 4},
+            "stirup": {"type": "m10", "spacing": 0.2, "clm_width": .4, "clm_bredth": .45,
+                       "clm_height": cdata['height'], "span": 0.25, "support_spacing": 0.1, "unit": "m"}
+        }
+        rows.append(cdata)
+    models = [ (Column(**row), Mainbar(**row['rebars']['main']), Stirup(**row['rebars']['stirup'])) for row in rows ]
+    start = time.perf_counter()
+    payload = pickle.dumps(models, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(payload)
+    pickled = time.perf_counter() - start
+    start = time.perf_counter()
+    table, strings = encode('column', rows)
+    encoded = time.perf_counter() - start
+    with SharedTables({'column': (table, strings)}) as shared:
+        start = time.perf_counter()
+        memory = shared_memory.SharedMemory(name=shared.memory.name)
+        attached, attached_strings = view(memory, 'column', *shared.layout['column'])
+        received = time.perf_counter() - start
+        start = time.perf_counter()
+        assert sum( 1 for _ in decode('column', attached, attached_strings) ) == members
+        decoded = time.perf_counter() - start
+        del attached, attached_strings
+        memory.close()
+    print(f"{members} columns: pickle {len(payload) / 1e6:.2f}MB {pickled:.3f}s round trip, "
+          f"binary {(table.nbytes + strings.blob.nbytes + strings.offsets.nbytes) / 1e6:.2f}MB encode {encoded:.3f}s attach {received * 1e6:.0f}us decode {decoded:.3f}s")
+    entries = [ ('column', row) for row in rows[:5000] ]
+    for workers in (1, 2):
+        start = time.perf_counter()
+        farm_shared(entries, workers)
+        print(f"{len(entries)} column reports over shared memory, {workers} workers: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    bench_ipc()
@@ -0,0 +1,291 @@
+# masonry.py
+from collections import Counter
+import functools
+import numpy as np
+
+try:
+    from catalog import catalog
+    from wallbatch import is_window, wall_tables, wall_takeoff
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.wallbatch import is_window, wall_tables, wall_takeoff
+
+
+BLOCK = (400, 200) # mm block length and course height used when cmulib has no block for a thickness
+WINDOW_SILL = 900 # mm, sill of windows placed by the layout
+DOOR_SILL = 0
+FILL = ('all', 'alternate', 'bars') # core fill: Notes.cnote['Wall'] 'core', 'acore', or only the cores holding vertical bars
+MORTAR_JOINT = 0.01 # m bed and head joint
+GROUT_MIX = '1:3' # cement : sand by volume
+MORTAR_MIX = '1:4'
+DRY_FACTOR = 1.33 # dry materials per m3 of placed grout or mortar
+CEMENT_DENSITY = 1440 # kg/m3
+
+
+@functools.lru_cache(maxsize=32)
+def block_size(thickness:float=None):
+    ''' (length, height) in mm of the cmulib block for a wall thickness in m.'''
+    block = catalog.cmulib.get(str(round(thickness * 1000)))
+    if not block:
+        return BLOCK
+    dimension = block.get('dimension')
+    return round(dimension.get('length') * 1000), round(dimension.get('height') * 1000)
+
+
+@functools.lru_cache(maxsize=32)
+def block_spec(thickness:float=None):
+    ''' (length, height, cores, core volume, mortar volume) of the cmulib block for a wall
+        thickness, in m and m3 per block. Blocks without a cmulib mortar volume are bedded on
+        MORTAR_JOINT joints with the bed joint left off the cores.
+    '''
+    block = catalog.cmulib.get(str(round(thickness * 1000))) or catalog.cmulib.get('200')
+    dimension = block.get('dimension')
+    length, height = dimension.get('length'), dimension.get('height')
+    core_volume = block.get('core_volume').get('metric').get('value')
+    mortar = block.get('mortar').get('metric').get('value')
+    if not mortar:
+        mortar = MORTAR_JOINT * ( (length * thickness) - (core_volume / height) + (height * thickness) )
+    return length, height, block.get('cores'), core_volume, mortar
+
+
+def place(length:int=None, height:int=None, openings:list=None):
+    ''' Opening rectangles (x0, x1, y0, y1) in mm for every opening instance.
+        openings are (window, width, height, amt, x, sill) in mm, x or sill None when not given.
+        Unpositioned openings are spread evenly along the wall, doors on the
+        base and windows at WINDOW_SILL. A positioned opening stands for one
+        instance, ValueError when its amt is more than 1.
+    '''
+    fixed, free = [], []
+    for window, width, opening_height, amt, x, sill in openings:
+        if x is not None and amt > 1:
+            raise ValueError(f"Opening at x={x}mm has amt {amt}, give each positioned opening its own entry")
+        if sill is None:
+            sill = min(WINDOW_SILL if window else DOOR_SILL, max(height - opening_height, 0))
+        for _ in range(amt):
+            (fixed if x is not None else free).append([x, width, sill, opening_height])
+    if free:
+        gap = max(length - sum( item[1] for item in free ), 0) // (len(free) + 1)
+        x = gap
+        for item in free:
+            item[0] = x
+            x += item[1] + gap
+    rectangles = np.array(fixed + free, dtype=np.int64).reshape(-1, 4)
+    x0, width, y0, opening_height = rectangles.T
+    return x0, x0 + width, y0, y0 + opening_height
+
+
+def segment_pieces(a=None, b=None, offset=0, block:int=400):
+    ''' Full blocks and the two end pieces (mm, 0 when none) of the segments a..b of a course
+        with joints at offset + k * block. A segment without a joint is a single piece.
+    '''
+    first = offset + -((offset - a) // block) * block # first joint at or after a
+    last = offset + ((b - offset) // block) * block # last joint at or before b
+    inside = first <= last
+    full = np.where(inside, (last - first) // block, 0)
+    return full, np.where(inside, first - a, b - a), np.where(inside, b - last, 0)
+
+
+def free_segments(length:int=None, gaps:list=None):
+    ''' Segments of a course of length mm left between the (x0, x1) gaps of its openings.'''
+    segments = []
+    position = 0
+    for start, end in sorted(gaps):
+        start, end = min(max(start, 0), length), min(max(end, 0), length)
+        if start > position:
+            segments.append((position, start))
+        position = max(position, end)
+    if position < length:
+        segments.append((position, length))
+    return segments
+
+
+def course_layout(length:int=None, height:int=None, openings:list=None, block:tuple=BLOCK):
+    ''' Running bond block layout of one wall on an integer mm grid.
+        Courses alternate between starting on a full and a half block. Blocks cut
+        to fit the wall ends, the openings or a short top course are counted as cut,
+        courses crossed by an opening's head or sill are cut over its width.
+        Courses with the same bond and openings are laid once and multiplied.
+        Returns {'courses', 'full', 'half', 'cut'}.
+    '''
+    block_length, block_height = block
+    courses = -(-height // block_height)
+    bottoms = np.arange(courses) * block_height
+    tops = np.minimum(bottoms + block_height, height)
+    x0, x1, y0, y1 = place(length, height, openings or [])
+    overlap = (y0[None, :] < tops[:, None]) & (y1[None, :] > bottoms[:, None])
+    through = overlap & (y0[None, :] <= bottoms[:, None]) & (y1[None, :] >= tops[:, None])
+    signatures = Counter(zip(
+        (np.arange(courses) % 2).tolist(), (tops - bottoms < block_height).tolist(),
+        map(tuple, overlap.tolist()), map(tuple, through.tolist())
+    ))
+    gaps = list(zip(x0.tolist(), x1.tolist()))
+    rows = [] # (a, b, offset, repeat, all cut)
+    for (odd, short, crossing, covering), repeat in signatures.items():
+        offset = block_length // 2 if odd else 0
+        for a, b in free_segments(length, [ gap for gap, crosses in zip(gaps, crossing) if crosses ]):
+            rows.append((a, b, offset, repeat, short))
+        for (a, b), crosses, covers in zip(gaps, crossing, covering):
+            if crosses and not covers: # head or sill inside the course, blocks over the opening are cut
+                rows.append((min(max(a, 0), length), min(max(b, 0), length), offset, repeat, True))
+    a, b, offset, repeat, cut_all = np.array(rows, dtype=np.int64).reshape(-1, 5).T
+    full, left, right = segment_pieces(a, b, offset, block_length)
+    pieces = (left > 0).astype(np.int64) + (right > 0)
+    half = (left == block_length // 2).astype(np.int64) + (right == block_length // 2)
+    cut_all = cut_all.astype(bool)
+    return {
+        "courses": courses,
+        "full": int((np.where(cut_all, 0, full) * repeat).sum()),
+        "half": int((np.where(cut_all, 0, half) * repeat).sum()),
+        "cut": int((np.where(cut_all, full + pieces, pieces - half) * repeat).sum())
+    }
+
+
+def wall_openings(openings=None):
+    ''' (window, width, height, amt, x, sill) mm tuples of the rows of a wallbatch opening table.'''
+    return [
+        (window, mm(width), mm(height), amt, mm(x), mm(sill))
+        for window, width, height, amt, x, sill in zip(*( openings[field].tolist() for field in ('window', 'width', 'height', 'amt', 'x', 'sill') ))
+    ]
+
+
+def mm(value:float=None):
+    return None if value is None or value != value else round(value * 1000)
+
+
+def wall_layout(wall=None):
+    ''' course_layout of a walls.Wall from its SI data and openings.'''
+    openings = [ (is_window(item.tag), mm(item.width), mm(item.height), item.amt, mm(item.x), mm(item.sill)) for item in wall.openings ]
+    return course_layout(mm(wall.data.length), mm(wall.data.height), openings, block_size(wall.data.thickness))
+
+
+def layout_walls(walls=None, openings=None, offsets=None):
+    ''' Block layout of every wall of wallbatch.wall_tables.
+        Returns arrays of courses, full, half and cut blocks per wall.
+        Walls with the same size, block and openings are laid out once.
+    '''
+    results = np.zeros((len(walls), 4), dtype=np.int64)
+    layouts = {}
+    lengths, heights = walls['length'].tolist(), walls['height'].tolist()
+    for i, thickness in enumerate(walls['thickness'].tolist()):
+        wall = (mm(lengths[i]), mm(heights[i]), block_size(thickness), tuple(wall_openings(openings[offsets[i]:offsets[i + 1]])))
+        layout = layouts.get(wall)
+        if layout is None:
+            layout = layouts[wall] = course_layout(wall[0], wall[1], list(wall[3]), wall[2])
+        results[i] = (layout['courses'], layout['full'], layout['half'], layout['cut'])
+    return { name: results[:, j] for j, name in enumerate(('courses', 'full', 'half', 'cut')) }
+
+
+def mix_materials(volume=None, mix:str=None):
+    ''' Cement (kg and bags) and sand (m3) of placed grout or mortar volumes in m3
+        for a cement : sand mix by volume.
+    '''
+    cement, sand = ( float(part) for part in mix.split(':') )
+    dry = np.asarray(volume, dtype=float) * DRY_FACTOR / (cement + sand)
+    cement = np.round(dry * cement * CEMENT_DENSITY, 3)
+    return {
+        "cement": cement,
+        "bags": np.ceil(cement / catalog.concrete_types.get('legend').get('bag_weight')[0]).astype(int),
+        "sand": np.round(dry * sand, 4)
+    }
+
+
+def fill_codes(fill=None, size:int=None):
+    ''' FILL index of one policy for every wall, or of a policy per wall.'''
+    if isinstance(fill, str):
+        return np.full(size, FILL.index(fill))
+    return np.array([ FILL.index(policy) for policy in fill ])
+
+
+def grout_takeoff(walls=None, blocks=None, fill='alternate', grout:str=GROUT_MIX, mortar:str=MORTAR_MIX):
+    ''' Core fill grout and bedding mortar of every wall of a wallbatch wall table, SI units.
+        blocks is the block count of each wall and fill one FILL policy or one per wall,
+        'bars' fills a core at each vertical bar (walls.Rebar spacing) over the wall height.
+        Returns arrays of cores, filled cores, grout and mortar volumes with their
+        cement and sand, and the totals of both.
+    '''
+    blocks = np.asarray(blocks)
+    specs = np.array([ block_spec(thickness) for thickness in walls['thickness'].tolist() ]).reshape(-1, 5)
+    length, height, cores, core_volume, mortar_volume = specs.T
+    cores = blocks * cores.astype(int)
+    courses = np.ceil(np.round(walls['height'] / height, 6)).astype(int)
+    bar_cores = np.round(walls['length'] / walls['v_spacing']).astype(int) * courses
+    filled = np.choose(fill_codes(fill, len(walls)), [ cores, -(-cores // 2), np.minimum(bar_cores, cores) ])
+    grout_volume = np.round(filled * core_volume / specs[:, 2], 4)
+    mortar_volume = np.round(blocks * mortar_volume, 4)
+    grout_materials = mix_materials(grout_volume, grout)
+    mortar_materials = mix_materials(mortar_volume, mortar)
+    takeoff = {
+        "cores": cores,
+        "filled_cores": filled,
+        "grout": grout_volume,
+        "mortar": mortar_volume,
+    }
+    for name, materials in (('grout', grout_materials), ('mortar', mortar_materials)):
+        for key, values in materials.items():
+            takeoff[f"{name}_{key}"] = values
+    takeoff["cement"] = grout_materials['cement'] + mortar_materials['cement']
+    takeoff["bags"] = grout_materials['bags'] + mortar_materials['bags']
+    takeoff["sand"] = grout_materials['sand'] + mortar_materials['sand']
+    return takeoff
+
+
+def project_grout(walls:list=None, openings:list=None, fill='alternate', grout:str=GROUT_MIX, mortar:str=MORTAR_MIX):
+    ''' grout_takeoff of a project's wall data dicts using the wallbatch block counts.
+        Returns the per wall takeoff with tags and the project totals.
+    '''
+    table, opening_table, _, tags = wall_tables(walls, openings)
+    takeoff = grout_takeoff(table, wall_takeoff(table, opening_table)['blocks'], fill, grout, mortar)
+    takeoff['tag'] = tags
+    totals = {
+        "grout": {"value": round(float(takeoff['grout'].sum()), 3), "unit": 'm3'},
+        "mortar": {"value": round(float(takeoff['mortar'].sum()), 3), "unit": 'm3'},
+        "cement": {"value": round(float(takeoff['cement'].sum()), 3), "unit": 'kg',
+                   "bag": {"value": int(takeoff['bags'].sum()), "unit": 'bag'}},
+        "sand": {"value": round(float(takeoff['sand'].sum()), 3), "unit": 'm3'}
+    }
+    return takeoff, totals
+
+
+def bench_layout(walls:int=2000):
+    import time
+    try:
+        from walls import data
+    except:
+        from modules.Estimate.walls import data
+    rng = np.random.default_rng(1)
+    rows = [
+        dict(data, tag=f"W{i}", length=round(float(rng.uniform(3, 30)), 2), height=round(float(rng.uniform(2.4, 4.5)), 2), thickness=[0.1, 0.15, 0.2][i % 3])
+        for i in range(walls)
+    ]
+    tables = wall_tables(rows)
+    start = time.perf_counter()
+    layout = layout_walls(*tables[:3])
+    elapsed = time.perf_counter() - start
+    print(f"{walls} walls laid out in {elapsed:.3f}s: {layout['full'].sum()} full {layout['half'].sum()} half {layout['cut'].sum()} cut blocks")
+
+
+def bench_grout(walls:int=20_000):
+    import time
+    try:
+        from walls import data
+    except:
+        from modules.Estimate.walls import data
+    rng = np.random.default_rng(1)
+    rows = [
+        dict(data, tag=f"W{i}", length=float(rng.uniform(3, 30)), height=float(rng.uniform(2.4, 4.5)), thickness=[0.1, 0.15, 0.2][i % 3])
+        for i in range(walls)
+    ]
+    fill = [ FILL[i % 3] for i in range(walls) ]
+    start = time.perf_counter()
+    for row, policy in zip(rows[:1000], fill):
+        project_grout([row], fill=policy)
+    each = (time.perf_counter() - start) * walls / 1000
+    start = time.perf_counter()
+    _, totals = project_grout(rows, fill=fill)
+    print(f"{walls} walls: per wall {each:.2f}s (estimated) batch {time.perf_counter() - start:.3f}s, "
+          f"grout {totals['grout']['value']}m3 mortar {totals['mortar']['value']}m3 {totals['cement']['bag']['value']} bags")
+
+
+if __name__ == '__main__':
+    bench_layout()
+    bench_grout()
@@ -0,0 +1,70 @@
+# memo.py
+import functools
+
+
+# Hits, misses and invalidations per cached property, e.g. stats['RCColumn.report']
+stats:dict = {}
+
+
+def state(*parts):
+    ''' Hashable snapshot of member inputs: slotted records, pydantic models,
+        lists of either, or plain values.
+    '''
+    snapshot = []
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            snapshot.append(state(*part))
+        elif hasattr(part, '__slots__') and not hasattr(part, '__dict__'):
+            snapshot.append(tuple( getattr(part, name) for name in part.__slots__ ))
+        elif hasattr(part, '__pydantic_fields__'):
+            snapshot.append(tuple(part.__dict__.values()))
+        else:
+            snapshot.append(part)
+    return tuple(snapshot)
+
+
+def fresh(value):
+    ''' Copy of the dicts and lists of a cached value, other values are shared.'''
+    if isinstance(value, dict):
+        return { key: fresh(item) for key, item in value.items() }
+    if isinstance(value, list):
+        return [ fresh(item) for item in value ]
+    return value
+
+
+def cached(method):
+    ''' Property that keeps its value until the object's inputs() snapshot changes.
+        Every read gets its own copy of the value's dicts and lists, so callers may
+        edit a report without changing what later reads return.
+    '''
+    name = method.__name__
+    counters = {}
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if not counters:
+            counters.update(hits=0, misses=0, invalidations=0)
+            stats[f"{type(self).__name__}.{name}"] = counters
+        inputs = self.inputs()
+        cache = self.__dict__.setdefault('_cache', {})
+        entry = cache.get(name)
+        if entry is not None:
+            if entry[0] == inputs:
+                counters['hits'] += 1
+                return fresh(entry[1])
+            counters['invalidations'] += 1
+        counters['misses'] += 1
+        value = method(self)
+        cache[name] = (inputs, value)
+        return fresh(value)
+    return property(wrapper)
+
+
+def invalidate(member):
+    ''' Drops every cached value of a member.'''
+    member.__dict__.pop('_cache', None)
+
+
+def cache_info():
+    ''' Copy of the hit, miss and invalidation counters of every cached property.'''
+    return { key: dict(value) for key, value in stats.items() }
@@ -0,0 +1,189 @@
+# records.py
+from typing import NamedTuple
+import numpy as np
+
+
+class BarGroup(NamedTuple):
+    ''' One group of identical cut bars of a member, lengths in m.
+        count includes the member amount.
+    '''
+    mark:str
+    type:str
+    shape:str
+    length:float
+    count:int
+
+
+class Record:
+    ''' Compact member record for trusted internal data.
+        Holds the same fields as the pydantic member model in SI units,
+        without validation or per instance dict.
+    '''
+    __slots__ = ()
+    dtype = None # NumPy structured dtype of a table of these records
+
+    def __init__(self, *values, **fields):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_model(cls, model):
+        return cls( *[ getattr(model, name) for name in cls.__slots__ ] )
+
+    def as_dict(self):
+        return { name: getattr(self, name) for name in self.__slots__ }
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all( getattr(self, name) == getattr(other, name) for name in self.__slots__ )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join( f'{name}={getattr(self, name)!r}' for name in self.__slots__ )})"
+
+    @classmethod
+    def table(cls, records:list=None):
+        ''' Packs records into one structured array of the class dtype.'''
+        return np.array([ tuple( getattr(record, name) for name in cls.dtype.names ) for record in records ], dtype=cls.dtype)
+
+
+class ColumnRecord(Record):
+    __slots__ = ('id', 'unit', 'width', 'bredth', 'height', 'amt', 'ctype')
+    dtype = np.dtype([('id', 'U16'), ('width', 'f8'), ('bredth', 'f8'), ('height', 'f8'), ('amt', 'i4'), ('ctype', 'U8')])
+
+    @property
+    def volume(self):
+        return round(((self.width * self.bredth ) * self.height),3)
+
+    @property
+    def girth(self):
+        return round(( self.width * 2) + (self.bredth * 2),2)
+
+    @property
+    def surface(self):
+        return self.girth * self.height
+
+    @staticmethod
+    def geometry(table):
+        girth = np.round(( table['width'] * 2) + (table['bredth'] * 2), 2)
+        return {
+            "volume": np.round((table['width'] * table['bredth']) * table['height'], 3),
+            "girth": girth,
+            "surface": girth * table['height']
+        }
+
+
+class BeamRecord(Record):
+    __slots__ = ('id', 'beam_type', 'unit', 'width', 'depth', 'length', 'amt', 'ctype')
+    dtype = np.dtype([('id', 'U16'), ('beam_type', 'U12'), ('width', 'f8'), ('depth', 'f8'), ('length', 'f8'), ('amt', 'i4'), ('ctype', 'U8')])
+
+    @property
+    def volume(self):
+        return round(((self.width * self.depth ) * self.length), 3)
+
+    @property
+    def girth(self):
+        if self.beam_type == 'suspended':
+            return round( self.width + (self.depth * 2), 2)
+        else:
+            return round( self.depth * 2,2)
+
+    @property
+    def surface(self):
+        return round( self.girth * self.length, 2)
+
+    @staticmethod
+    def geometry(table):
+        girth = np.round(np.where(table['beam_type'] == 'suspended', table['width'] + (table['depth'] * 2), table['depth'] * 2), 2)
+        return {
+            "volume": np.round((table['width'] * table['depth']) * table['length'], 3),
+            "girth": girth,
+            "surface": np.round(girth * table['length'], 2)
+        }
+
+
+class FootingRecord(Record):
+    __slots__ = ('id', 'unit', 'width', 'depth', 'length', 'excavation_depth', 'ctype')
+    dtype = np.dtype([('id', 'U16'), ('width', 'f8'), ('depth', 'f8'), ('length', 'f8'), ('excavation_depth', 'f8'), ('ctype', 'U8')])
+
+    @property
+    def volume(self):
+        return round(((self.width * self.depth ) * self.length), 3)
+
+    @property
+    def excavation(self):
+        return round(((self.width * self.excavation_depth ) * self.length), 3)
+
+    @staticmethod
+    def geometry(table):
+        return {
+            "volume": np.round((table['width'] * table['depth']) * table['length'], 3),
+            "excavation": np.round((table['width'] * table['excavation_depth']) * table['length'], 3)
+        }
+
+
+class SlabRecord(Record):
+    __slots__ = ('id', 'unit', 'width', 'depth', 'length', 'span', 'ctype', 'notes')
+    dtype = np.dtype([('id', 'U16'), ('width', 'f8'), ('depth', 'f8'), ('length', 'f8'), ('span', 'f8'), ('ctype', 'U8')])
+
+    @property
+    def volume(self):
+        return round(((self.width * self.length ) * self.depth), 3)
+
+    @property
+    def surface(self):
+        return round( self.width * self.length, 2)
+
+    @staticmethod
+    def geometry(table):
+        return {
+            "volume": np.round((table['width'] * table['length']) * table['depth'], 3),
+            "surface": np.round(table['width'] * table['length'], 2)
+        }
+
+
+class FloorRecord(Record):
+    __slots__ = ('id', 'unit', 'width', 'depth', 'length', 'mesh', 'ctype', 'notes')
+    dtype = np.dtype([('id', 'U16'), ('width', 'f8'), ('depth', 'f8'), ('length', 'f8'), ('ctype', 'U8')])
+
+    @property
+    def volume(self):
+        return round(((self.width * self.length ) * self.depth), 3)
+
+    @property
+    def surface(self):
+        return round( self.width * self.length, 2)
+
+    @staticmethod
+    def geometry(table):
+        return {
+            "volume": np.round((table['width'] * table['length']) * table['depth'], 3),
+            "surface": np.round(table['width'] * table['length'], 2)
+        }
+
+
+def bench_records(members:int=50_000):
+    import sys, time
+    try:
+        from structural import Column
+    except:
+        from modules.Estimate.structural import Column
+    rows = [ dict(id=f"C{i}", unit='m', width=0.4, bredth=0.45, height=3.0 + (i % 7) * 0.1, amt=1, ctype='m15') for i in range(members) ]
+    start = time.perf_counter()
+    models = [ Column( **row ) for row in rows ]
+    volume = sum( model.volume for model in models )
+    validated = time.perf_counter() - start
+    start = time.perf_counter()
+    records = [ ColumnRecord( **row ) for row in rows ]
+    assert round(sum( record.volume for record in records ), 3) == round(volume, 3)
+    slotted = time.perf_counter() - start
+    table = ColumnRecord.table(records)
+    start = time.perf_counter()
+    ColumnRecord.geometry(table)
+    array = time.perf_counter() - start
+    print(f"{members} columns: pydantic {validated:.3f}s slots {slotted:.3f}s table {array:.4f}s")
+    print(f"bytes per member: pydantic {sys.getsizeof(models[0]) + sys.getsizeof(models[0].__dict__)} slots {sys.getsizeof(records[0])} table {table.dtype.itemsize}")
+
+
+if __name__ == '__main__':
+    bench_records()
@@ -0,0 +1,96 @@
+# rollup.py
+import numpy as np
+
+try:
+    from catalog import catalog
+    from units import KG_PER_LB
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.units import KG_PER_LB
+
+
+CATEGORIES:tuple = ('column', 'beam', 'foundation', 'slab', 'wall')
+
+
+def bar_table(members=None, repeats:list=None):
+    ''' Collects every bar group of the members into typed arrays:
+        catalog bar id, member category index, cut length (m) and count.
+        repeats optionally multiplies the bar counts of each member.
+    '''
+    sizes = catalog.bar_ids
+    categories = { name: i for i, name in enumerate(CATEGORIES) }
+    size, category, length, count = [], [], [], []
+    for member, repeat in zip(members, repeats or [1] * len(members)):
+        kind = categories[member.category]
+        for group in member.bar_groups():
+            size.append(sizes[group.type])
+            category.append(kind)
+            length.append(group.length)
+            count.append(group.count * repeat)
+    return (
+        np.array(size, dtype=np.int32), np.array(category, dtype=np.int32),
+        np.array(length, dtype=float), np.array(count, dtype=np.int64)
+    )
+
+
+def reduce_bars(size=None, category=None, length=None, count=None):
+    ''' Grouped reduction of bar groups by size and member category.
+        Returns a (sizes, categories) array of total bar length in m.
+    '''
+    shape = (len(catalog.bars), len(CATEGORIES))
+    totals = np.bincount(size * shape[1] + category, weights=length * count, minlength=shape[0] * shape[1])
+    return totals.reshape(shape)
+
+
+def rollup(members=None, table:tuple=None, totals=None):
+    ''' Project rebar tonnage by bar size and by member category in kg and lb,
+        with the stock bars needed per size. table is an optional prepared bar_table
+        and totals an optional reduce_bars result.
+    '''
+    if totals is None:
+        totals = reduce_bars( *(table if table is not None else bar_table(members)) )
+    specs = catalog.specs
+    kg_per_m = catalog.bar_arrays['kg_per_m']
+    stock = catalog.bar_arrays['length_m']
+    weights = totals * kg_per_m[:, None]
+    size_length = totals.sum(axis=1)
+    size_weight = weights.sum(axis=1)
+    rebars = np.ceil(size_length / stock).astype(int)
+    return {
+        "sizes": {
+            spec.type: {
+                "length": {"value": round(float(size_length[i]), 3), "unit": 'm'},
+                "rebars": int(rebars[i]),
+                "weight": {"value": round(float(size_weight[i]), 3), "unit": 'kg'},
+                "weight_lb": {"value": round(float(size_weight[i]) / KG_PER_LB, 3), "unit": 'lb'}
+            } for i, spec in enumerate(specs) if size_length[i]
+        },
+        "categories": {
+            name: {
+                spec.type: round(float(weights[i, j]), 3) for i, spec in enumerate(specs) if weights[i, j]
+            } for j, name in enumerate(CATEGORIES) if weights[:, j].any()
+        },
+        "total": {
+            "weight": {"value": round(float(size_weight.sum()), 3), "unit": 'kg'},
+            "weight_lb": {"value": round(float(size_weight.sum()) / KG_PER_LB, 3), "unit": 'lb'},
+            "rebars": int(rebars.sum())
+        }
+    }
+
+
+def bench_rollup(groups:int=500_000):
+    import time
+    rng = np.random.default_rng(1)
+    table = (
+        rng.integers(0, len(catalog.bars), groups).astype(np.int32),
+        rng.integers(0, len(CATEGORIES), groups).astype(np.int32),
+        rng.uniform(0.5, 12, groups),
+        rng.integers(1, 200, groups)
+    )
+    start = time.perf_counter()
+    totals = rollup(table=table)
+    print(f"{groups} bar groups rolled up in {time.perf_counter() - start:.3f}s, {totals['total']['weight']['value'] / 1000:.1f}t")
+
+
+if __name__ == '__main__':
+    bench_rollup()
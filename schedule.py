@@ -0,0 +1,125 @@
+# schedule.py
+import csv
+import json
+import math
+
+try:
+    from catalog import catalog
+    from units import SI, KG_PER_LB, factor
+    from splice import lap_length, LAP_DIAMETERS
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.units import SI, KG_PER_LB, factor
+    from modules.Estimate.splice import lap_length, LAP_DIAMETERS
+
+
+FIELDS:tuple = ('member', 'mark', 'size', 'shape', 'cut_length', 'count', 'laps', 'weight')
+
+
+def member_tag(member):
+    ''' Tag of a structural member or wall as given by the caller.'''
+    return getattr(member.data, 'id', None) or getattr(member.data, 'tag', None)
+
+
+def stock_cuts(bar_type:str=None, length:float=None, stock:float=None, laps:float=LAP_DIAMETERS):
+    ''' Pieces cut for one run of bars, as (cut length in m, pieces per run, laps per run).
+        A run longer than the stock bar takes whole stock bars, each lapped onto
+        the next piece, and one remainder piece, as cutting.pack_size packs it.
+    '''
+    stock = stock or catalog.bar(bar_type).length_m
+    if length <= stock:
+        return [(length, 1, 0)]
+    lap = lap_length(bar_type, laps)
+    whole = math.ceil((length - stock) / (stock - lap))
+    return [(stock, whole, whole), (length - whole * (stock - lap), 1, 0)]
+
+
+def schedule_rows(members=None, unit:str=SI, stock:dict=None, laps:float=LAP_DIAMETERS):
+    ''' Bar bending schedule rows, one per cut length of every bar group of every member.
+        Runs longer than the stock bar are lapped, a row of whole stock bars carrying
+        the laps and a row of the remainder piece.
+        members may be any iterable, rows are yielded as they are built
+        so the schedule is never held in memory.
+    '''
+    length = factor(SI, unit) if unit != SI else 1
+    mass = 1 / KG_PER_LB if unit == 'ft' else 1
+    stock = stock or {}
+    for member in members:
+        tag = member_tag(member)
+        for group in member.bar_groups():
+            bar = catalog.bar(group.type)
+            for cut_length, pieces, splices in stock_cuts(group.type, group.length, stock.get(group.type), laps):
+                count = group.count * pieces
+                yield {
+                    "member": tag,
+                    "mark": group.mark,
+                    "size": catalog.convert_bar(group.type) if unit == 'ft' else group.type,
+                    "shape": group.shape,
+                    "cut_length": round(cut_length * length, 3),
+                    "count": count,
+                    "laps": group.count * splices,
+                    "weight": round(cut_length * count * bar.kg_per_m * mass, 3)
+                }
+
+
+def to_csv(rows=None, stream=None):
+    ''' Writes schedule rows to an open text stream as CSV, returns the number of rows.'''
+    writer = csv.DictWriter(stream, fieldnames=FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def to_ndjson(rows=None, stream=None):
+    ''' Writes schedule rows to an open text stream as one JSON object per line.'''
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+WRITERS:dict = {'csv': to_csv, 'ndjson': to_ndjson}
+
+
+def write_schedule(members=None, path:str=None, format:str='csv', unit:str=SI):
+    ''' Streams the bar bending schedule of the members to a CSV or NDJSON file.'''
+    with open(path, 'w', newline='') as stream:
+        return WRITERS[format](schedule_rows(members, unit), stream)
+
+
+def bench_schedule(members:int=50_000):
+    import os, tempfile, time, tracemalloc
+    try:
+        from structural import RCColumn
+    except:
+        from modules.Estimate.structural import RCColumn
+
+    def columns():
+        for i in range(members):
+            cdata = dict(id=f"C{i}", height=3.0 + (i % 7) * 0.1, width=.4, bredth=.45, amt=1, unit='m', ctype='m15')
+            cdata['rebars'] = {
+                "main": {"type": "m16", "unit": "m", "length": 3.0, "amt": 4},
+                "stirup": {"type": "m10", "spacing": 0.25, "clm_width": .4, "clm_bredth": .45,
+                           "clm_height": cdata['height'], "unit": "m"}
+            }
+            yield RCColumn(cdata)
+
+    path = os.path.join(tempfile.mkdtemp(), 'schedule.csv')
+    start = time.perf_counter()
+    rows = write_schedule(columns(), path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start() # traced separately, tracing slows the run down
+    write_schedule(columns(), path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{rows} schedule rows in {elapsed:.2f}s, peak {peak / 1e6:.2f}MB, file {os.path.getsize(path) / 1e6:.1f}MB")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    bench_schedule()
@@ -4,6 +4,10 @@ from logging.handlers import TimedRotatingFileHandler
 from modules.estimator.schema import SlabSchema, RebarSchema
 from modules.estimator.library import Library
 from siteplan.modules.Estimate.econfig import (LOG_PATH ,SYSTEM_LOG_PATH ,SERVER_LOG_PATH, APP_LOG_PATH )
+try:
+    from units import convert_record
+except:
+    from modules.Estimate.units import convert_record
 
 
 lib = Library()
@@ -22,20 +26,8 @@ logger = logging.handlers.TimedRotatingFileHandler(
     encoding='utf-8')
 root_logger.addHandler(logger)
 
-def convert_bar(bar):
-    converter = {
-        "m6": "1/4",
-        "m10": "3/8",
-        "m12": "1/2",
-        "m16": "5/8",
-        "m20": "3/4",
-        "3/4": "m20",
-        "5/8": "m16",
-        "1/2": "m12",
-        "3/8": "m10",
-        "1/4": "m6"
-    }
-    return converter.get(bar, '1/2')
+REBAR_SPACINGS:tuple = ('b0_spacing', 'b1_spacing', 'b2_spacing', 't0_spacing', 't1_spacing', 't2_spacing')
+REBAR_BARS:tuple = ('b0', 'b1', 'b2', 't0', 't1', 't2')
 
 class Slab:
     def __init__( 
@@ -62,63 +54,14 @@ class Slab:
     def process_rebars(self):
         unit = self.usys.get('length')
         try:
-            if unit == self.rebar.unit:
-                pass
-            elif unit == "m" and self.rebar.unit== 'mm':
-                factor = 1000
-                self.rebar.unit = "m"
-                self.rebar.b0_spacing = round(self.rebar.b0_spacing / factor,2)
-                self.rebar.b1_spacing = round(self.rebar.b1_spacing / factor,2)
-                self.rebar.b2_spacing = round(self.rebar.b2_spacing / factor,2)
-                self.rebar.t0_spacing = round(self.rebar.t0_spacing / factor,2)
-                self.rebar.t1_spacing = round(self.rebar.t1_spacing / factor,2)
-                self.rebar.t2_spacing = round(self.rebar.t2_spacing / factor,2)
-            elif unit == "m" and self.rebar.unit== 'ft':
-                factor = 0.3048
-                self.rebar.unit = "m"
-                self.rebar.b0_spacing = round(self.rebar.b0_spacing * factor,2)
-                self.rebar.b1_spacing = round(self.rebar.b1_spacing * factor,2)
-                self.rebar.b2_spacing = round(self.rebar.b2_spacing * factor,2)
-                self.rebar.t0_spacing = round(self.rebar.t0_spacing * factor,2)
-                self.rebar.t1_spacing = round(self.rebar.t1_spacing * factor,2)
-                self.rebar.t2_spacing = round(self.rebar.t2_spacing * factor,2)
-                self.rebar.b0 = convert_bar(self.rebar.b0)
-                self.rebar.b1 = convert_bar(self.rebar.b1)
-                self.rebar.b2 = convert_bar(self.rebar.b2)
-                self.rebar.t0 = convert_bar(self.rebar.t0)
-                self.rebar.t1 = convert_bar(self.rebar.t1)
-                self.rebar.t2 = convert_bar(self.rebar.t2)
-
-            elif unit == "ft" and self.rebar.unit== 'mm':
-                factor = 304.8
-                self.rebar.unit = "ft"
-                self.rebar.b0_spacing = round(self.rebar.b0_spacing / factor,2)
-                self.rebar.b1_spacing = round(self.rebar.b1_spacing / factor,2)
-                self.rebar.b2_spacing = round(self.rebar.b2_spacing / factor,2)
-                self.rebar.t0_spacing = round(self.rebar.t0_spacing / factor,2)
-                self.rebar.t1_spacing = round(self.rebar.t1_spacing / factor,2)
-                self.rebar.t2_spacing = round(self.rebar.t2_spacing / factor,2)
-                self.rebar.b0 = convert_bar(self.rebar.b0)
-                self.rebar.b1 = convert_bar(self.rebar.b1)
-                self.rebar.b2 = convert_bar(self.rebar.b2)
-                self.rebar.t0 = convert_bar(self.rebar.t0)
-                self.rebar.t1 = convert_bar(self.rebar.t1)
-                self.rebar.t2 = convert_bar(self.rebar.t2)
-            elif unit == "ft" and self.rebar.unit== 'm':
-                factor = 3.048
-                self.rebar.unit = "ft"
-                self.rebar.b0_spacing = round(self.rebar.b0_spacing * factor,2)
-                self.rebar.b1_spacing = round(self.rebar.b1_spacing * factor,2)
-                self.rebar.b2_spacing = round(self.rebar.b2_spacing * factor,2)
-                self.rebar.t0_spacing = round(self.rebar.t0_spacing * factor,2)
-                self.rebar.t1_spacing = round(elf.rebar.t1_spacing * factor,2)
-                self.rebar.t2_spacing = round(self.rebar.t2_spacing * factor,2)
-                self.rebar.b0 = convert_bar(self.rebar.b0)
-                self.rebar.b1 = convert_bar(self.rebar.b1)
-                self.rebar.b2 = convert_bar(self.rebar.b2)
-                self.rebar.t0 = convert_bar(self.rebar.t0)
-                self.rebar.t1 = convert_bar(self.rebar.t1)
-                self.rebar.t2 = convert_bar(self.rebar.t2)
+            if unit != self.rebar.unit:
+                converted = convert_record(
+                    self.rebar, self.rebar.unit, unit,
+                    lengths=REBAR_SPACINGS, bars=REBAR_BARS, digits=2
+                    )
+                for field, value in converted.items():
+                    setattr(self.rebar, field, value)
+                self.rebar.unit = unit
         except Exception as e:
             logging.warning(e)        
 
@@ -127,24 +70,15 @@ class Slab:
     @property
     def to_meter(self):
         unit = self.data.unit
-        if unit == 'mm':
-            factor = 1000
-            self.data.length = self.data.length / factor
-            self.data.width = self.data.width / factor
-            self.data.thickness = self.data.thickness / factor
+        if unit in ('mm', 'ft'):
+            converted = convert_record(self.data, unit, 'm', lengths=('length', 'width', 'thickness'))
+            for field, value in converted.items():
+                setattr(self.data, field, value)
+            self.data.unit = 'm'
             self.set_span
             self.set_quarter_span
-            self.set_unit_system('m') 
-            logging.info("Measurement system Converted from millimeters to meters." )         
-        elif unit == 'ft':
-            factor = 0.304
-            self.data.length = self.data.length * factor
-            self.data.width = self.data.width * factor
-            self.data.thickness = self.data.thickness * factor
-            self.set_span
-            self.set_quarter_span            
             self.set_unit_system('m')
-            logging.info("Measurement system Converted from feet to meters." )  
+            logging.info(f"Measurement system Converted from {unit} to meters." )
         else:
             self.set_unit_system('m')            
         
@@ -232,7 +166,7 @@ class Slab:
                     "value": round(self.area * self.data.thickness, 3),
                     "unit": self.usys.get('volume')
                 },                
-                "concrete": await lib.get_resource(f'structure-grades-{self.data.concrete}'),
+                "concrete": await lib.get_resource(f'structure-grades-{self.data.concrete}', copy=True),
                 
                 "formwork": {
                     "data": {
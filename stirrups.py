@@ -0,0 +1,140 @@
+# stirrups.py
+import numpy as np
+
+try:
+    from splice import bar_properties
+except:
+    from modules.Estimate.splice import bar_properties
+
+
+COVER = 0.025 # m of cover on each face
+STIRRUP_LAP = 0.1 # m of hook lap closing a stirrup
+LINK_LAP = 0.15 # m of hook lap on a footing link
+
+
+def column(values=None, size:int=None):
+    ''' Float array of member values, None becomes 0.'''
+    if values is None:
+        return np.zeros(size)
+    array = np.array(values, dtype=float)
+    np.copyto(array, 0, where=np.isnan(array))
+    return array
+
+
+def check_spacing(spacings=None):
+    ''' Raises ValueError unless every spacing is above 0, a 0 spacing would count infinite bars.'''
+    if np.any(np.asarray(spacings) <= 0):
+        raise ValueError("Bar spacing must be greater than 0")
+
+
+def stirrup_length(width:float=None, bredth:float=None):
+    ''' Cut length in m of one closed stirrup.'''
+    return ( (bredth - (COVER * 2) )* 2 ) + ((width - (COVER * 2)) * 2 ) + STIRRUP_LAP
+
+
+def stirrup_count(height:float=None, spacing:float=None, span:float=None, support_spacing:float=None):
+    ''' Main, support and total stirrups of one member, the closed form of stirrup_takeoff.
+        support is None when the member has no closer spaced zone at the supports.
+    '''
+    if spacing <= 0:
+        raise ValueError("Bar spacing must be greater than 0")
+    if span and support_spacing:
+        support_length = height * span * 2
+        support = support_length / support_spacing
+        main = (height - support_length) / spacing
+        return round(main), round(support), round(main + support)
+    main = round(height / spacing)
+    return main, None, main
+
+
+def link_length(width:float=None):
+    ''' Cut length in m of one footing link.'''
+    return (width - (COVER * 2) ) + LINK_LAP
+
+
+def link_count(length:float=None, spacing:float=None):
+    ''' Links of one footing, the closed form of link_takeoff.'''
+    if spacing <= 0:
+        raise ValueError("Bar spacing must be greater than 0")
+    return round(length / spacing)
+
+
+def bar_totals(takeoff:dict=None, types=None):
+    ''' Adds total length, stock bars and weight of the counted bars to a takeoff.'''
+    stock_length, _, kg_per_m = bar_properties(types)
+    total_length = takeoff['length'] * takeoff['total']
+    takeoff['total_length'] = total_length
+    takeoff['rebars'] = np.round(total_length / stock_length).astype(int)
+    takeoff['weight'] = np.round(total_length * kg_per_m, 3)
+    return takeoff
+
+
+def stirrup_takeoff(widths=None, bredths=None, heights=None, spacings=None, spans=None,
+                    support_spacings=None, types=None, amounts=None):
+    ''' Stirrup counts, cut lengths and weights for a whole schedule of columns or beams in SI units.
+        Members with a span fraction and support spacing get closer stirrups over
+        height * span at each end. amounts optionally multiplies the counts per member.
+    '''
+    widths = column(widths)
+    size = len(widths)
+    bredths, heights, spacings = column(bredths), column(heights), column(spacings)
+    check_spacing(spacings)
+    spans, support_spacings = column(spans, size), column(support_spacings, size)
+    length = ( (bredths - (COVER * 2) )* 2 ) + ((widths - (COVER * 2)) * 2 ) + STIRRUP_LAP
+    zoned = (spans > 0) & (support_spacings > 0)
+    support_length = np.where(zoned, heights * spans * 2, 0)
+    support = np.divide(support_length, support_spacings, out=np.zeros(size), where=zoned)
+    main = (heights - support_length) / spacings
+    total = np.where(zoned, np.round(main + support), np.round(main)).astype(int)
+    if amounts is not None:
+        total = total * np.asarray(amounts, dtype=int)
+    takeoff = {
+        "main": np.round(main).astype(int),
+        "support": np.round(support).astype(int),
+        "zoned": zoned,
+        "total": total,
+        "length": length
+    }
+    return bar_totals(takeoff, types)
+
+
+def link_takeoff(widths=None, lengths=None, spacings=None, types=None, amounts=None):
+    ''' Link counts, cut lengths and weights for a whole schedule of strip footings in SI units.'''
+    widths, lengths, spacings = column(widths), column(lengths), column(spacings)
+    check_spacing(spacings)
+    total = np.round(lengths / spacings).astype(int)
+    if amounts is not None:
+        total = total * np.asarray(amounts, dtype=int)
+    takeoff = {
+        "total": total,
+        "length": (widths - (COVER * 2) ) + LINK_LAP
+    }
+    return bar_totals(takeoff, types)
+
+
+def bench_stirrups(members:int=100_000):
+    import time
+    try:
+        from structural import Stirup
+    except:
+        from modules.Estimate.structural import Stirup
+    rng = np.random.default_rng(1)
+    widths, bredths = rng.uniform(0.2, 0.6, members), rng.uniform(0.2, 0.6, members)
+    heights = rng.uniform(2.5, 8, members)
+    types = ['m10'] * members
+    specs = [
+        Stirup(type='m10', unit='m', clm_width=w, clm_bredth=b, clm_height=h, spacing=0.2, span=0.25, support_spacing=0.1)
+        for w, b, h in zip(widths[:2000], bredths[:2000], heights[:2000])
+    ]
+    start = time.perf_counter()
+    for spec in specs:
+        spec.bars
+    single = (time.perf_counter() - start) / len(specs)
+    start = time.perf_counter()
+    stirrup_takeoff(widths, bredths, heights, [0.2] * members, [0.25] * members, [0.1] * members, types)
+    batch = time.perf_counter() - start
+    print(f"{members} members: per member {single * members:.2f}s (extrapolated) batch {batch:.3f}s")
+
+
+if __name__ == '__main__':
+    bench_stirrups()
@@ -1,13 +1,26 @@
 # Column.py
-import json
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
+from typing import ClassVar
 try:
-    from elibrary import Library
+    from catalog import catalog
+    from concrete import member_concrete
+    from units import SI, to_si, si_record, present, present_record, present_bars
+    from records import BarGroup, ColumnRecord, BeamRecord, FootingRecord, SlabRecord, FloorRecord
+    from memo import cached, state
+    from splice import splice
+    from stirrups import stirrup_length, stirrup_count, link_length, link_count
 except:
-    from modules.Estimate.elibrary import Library
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.concrete import member_concrete
+    from modules.Estimate.units import SI, to_si, si_record, present, present_record, present_bars
+    from modules.Estimate.records import BarGroup, ColumnRecord, BeamRecord, FootingRecord, SlabRecord, FloorRecord
+    from modules.Estimate.memo import cached, state
+    from modules.Estimate.splice import splice
+    from modules.Estimate.stirrups import stirrup_length, stirrup_count, link_length, link_count
 
 
 class Column(BaseModel):
+    lengths:ClassVar[tuple] = ('width', 'bredth', 'height')
     id:str
     unit:str | None = None
     width:float
@@ -31,6 +44,7 @@ class Column(BaseModel):
    
 
 class Beam(BaseModel):
+    lengths:ClassVar[tuple] = ('width', 'depth', 'length')
     id:str
     beam_type:str
     unit:str | None = None
@@ -59,6 +73,7 @@ class Beam(BaseModel):
   
 
 class Mainbar(BaseModel):
+    lengths:ClassVar[tuple] = ('length', 'spacing')
     type:str
     unit:str
     length:float = 0
@@ -67,33 +82,34 @@ class Mainbar(BaseModel):
     
     @property
     def data(self):
-        return Library().rebarnotes.get(self.type)    
+        return catalog.rebarnotes.get(self.type)    
     
     @property
     def cut_length(self):
-        if float(self.length) < 9.0:
+        stock = catalog.bar(self.type).length_m
+        if float(self.length) < stock:
             return { "value": float(self.length), "unit": self.unit }
         else:
-            return { "value": 9.0, "unit": self.unit }
+            return { "value": stock, "unit": self.unit }
+
+    @property
+    def spliced(self):
+        ''' Segments, laps, lapped length and weight of the run, see splice.splice.'''
+        return { key: value[0].item() for key, value in splice([self.length], [self.amt], [self.type]).items() }
 
     @property
     def bars(self):
-        if self.unit == 'm':
-            bar_length = self.data.get('standard_length').get('metric').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('metric').get('value')
-            weight_per_unit = 'kg'
-        else:
-            bar_length = self.data.get('standard_length').get('imperial').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('imperial').get('value')
-            weight_per_unit = 'lb'        
+        bar = catalog.bar(self.type)
+        bar_length, bar_weight_per_unit, weight_per_unit = bar.system(SI)
         return {
-            'rebars': { "type": f"{self.type} ( {self.data.get('insize')}inch )", "value": round((self.length * self.amt ) / bar_length), "unit": "length"},
+            'rebars': { "type": bar.label, "value": round((self.length * self.amt ) / bar_length), "unit": "length"},
             'weight': { "value": round((self.length * self.amt ) * bar_weight_per_unit, 3), "unit": weight_per_unit }           
 
         }
 
 
 class Stirup(BaseModel):    
+    lengths:ClassVar[tuple] = ('clm_width', 'clm_bredth', 'clm_height', 'spacing', 'support_spacing', 'cut_length')
     type:str
     unit:str
     clm_width:float 
@@ -105,13 +121,11 @@ class Stirup(BaseModel):
 
     @property
     def data(self):
-        return Library().rebarnotes.get(self.type)  
+        return catalog.rebarnotes.get(self.type)  
 
     @property
     def length(self):
-        cover = 0.025
-        lap = 0.1
-        return ( (self.clm_bredth - (cover * 2) )* 2 ) + ((self.clm_width - (cover * 2)) * 2 ) + lap
+        return stirrup_length(self.clm_width, self.clm_bredth)
 
     @property
     def over_support(self):
@@ -121,42 +135,27 @@ class Stirup(BaseModel):
 
     @property
     def stirups(self):
-        if self.span and self.support_spacing:
-            support_length = self.over_support * 2
-            support_stirups = support_length / self.support_spacing
-            main_stirups = (self.clm_height - support_length) / self.spacing
-            return {
-                "main": round(main_stirups), 
-                "support": round(support_stirups), 
-                "total": round(main_stirups + support_stirups),
-                "length": self.length
-                }
-        else:
-            main_stirups = round(self.clm_height / self.spacing)
-            return {
-                "main": main_stirups,                
-                "total": main_stirups,
-                "length": self.length
-                }        
+        main, support, total = stirrup_count(self.clm_height, self.spacing, self.span, self.support_spacing)
+        stirups = { "main": main }
+        if support is not None:
+            stirups['support'] = support
+        stirups.update(total=total, length=self.length)
+        return stirups
 
     @property
     def bars(self):
-        if self.unit == 'm':
-            bar_length = self.data.get('standard_length').get('metric').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('metric').get('value')
-            weight_per_unit = 'kg'
-        else:
-            bar_length = self.data.get('standard_length').get('imperial').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('imperial').get('value')
-            weight_per_unit = 'lb'        
+        bar = catalog.bar(self.type)
+        bar_length, bar_weight_per_unit, weight_per_unit = bar.system(SI)
+        total_length = self.length * self.stirups.get('total')
         return {
-            'rebars': { "type": f"{self.type} ( {self.data.get('insize')}inch )", "value": round((self.length * self.stirups.get('total') ) / bar_length), "unit": "length"},
-            'weight': { "value": round((self.length * self.stirups.get('total') ) * bar_weight_per_unit, 3), "unit": weight_per_unit }            
+            'rebars': { "type": bar.label, "value": round(total_length / bar_length), "unit": "length"},
+            'weight': { "value": round(total_length * bar_weight_per_unit, 3), "unit": weight_per_unit }
 
         }
 
 
 class Links(BaseModel):    
+    lengths:ClassVar[tuple] = ('ftn_width', 'ftn_length', 'spacing', 'cut_length')
     type:str
     unit:str
     ftn_width:float 
@@ -165,53 +164,77 @@ class Links(BaseModel):
 
     @property
     def data(self):
-        return Library().rebarnotes.get(self.type)  
+        return catalog.rebarnotes.get(self.type)  
 
     @property
     def length(self):
-        cover = 0.025
-        lap = 0.15
-        return  (self.ftn_width - (cover * 2) ) + lap
+        return link_length(self.ftn_width)
 
-    
     @property
-    def link(self):        
-        return {                               
-                "total": round(self.ftn_length / self.spacing),
+    def link(self):
+        return {
+                "total": link_count(self.ftn_length, self.spacing),
                 "length": self.length
-                }        
+                }
 
     @property
     def bars(self):
-        if self.unit == 'm':
-            bar_length = self.data.get('standard_length').get('metric').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('metric').get('value')
-            weight_per_unit = 'kg'
-        else:
-            bar_length = self.data.get('standard_length').get('imperial').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('imperial').get('value')
-            weight_per_unit = 'lb'        
+        bar = catalog.bar(self.type)
+        bar_length, bar_weight_per_unit, weight_per_unit = bar.system(SI)
+        total_length = self.length * self.link.get('total')
         return {
-            'rebars': { "type": f"{self.type} ( {self.data.get('insize')}inch )", "value": round((self.length * self.link.get('total') ) / bar_length), "unit": "length"},
-            'weight': { "value": round((self.length * self.link.get('total') ) * bar_weight_per_unit, 3), "unit": weight_per_unit }            
+            'rebars': { "type": bar.label, "value": round(total_length / bar_length), "unit": "length"},
+            'weight': { "value": round(total_length * bar_weight_per_unit, 3), "unit": weight_per_unit }
 
         }
 
 
+def bar_group(rebar, unit:str=SI, amt:int=1, exclude:dict=None, **data):
+    ''' Builds the report of one rebar group (rebars, weight, data) in the
+        caller's unit system. The bars of the rebar spec are computed once and
+        scaled by the member amount, extra data is added to the spec dump.
+    '''
+    group = rebar.bars
+    if amt != 1:
+        group['rebars']['value'] = group['rebars']['value'] * amt # calucale the total amount of bars
+        group['weight']['value'] = group['weight']['value'] * amt
+    group['data'] = rebar.model_dump(exclude=exclude)
+    group['data'].update(data)
+    return present_bars(type(rebar), group, unit)
+
+
+def stirup_exclude(stirups):
+    exclude = { "clm_width": True, "clm_bredth": True, "clm_height": True }
+    if not stirups.span or not stirups.support_spacing:
+        exclude["span"] = True
+        exclude["support_spacing"] = True
+    return exclude
+
+
 class RCColumn:
     """ Reinforced Concrete Column """
+    category = 'column'
     def __init__(self, data:dict=None):
         
         if data:
-            self.data = Column( **data )
-            data['rebars']['main']["length"] = self.data.height
-            self.mainbars = Mainbar( **data['rebars']['main'])
-            self.stirups = Stirup( **data['rebars']['stirup'])              
-            self.set_unit_system(self.data.unit)
+            self.set_unit_system(data.get('unit'))
+            self.data = ColumnRecord.from_model(to_si(Column, data, self.unit))
+            self.mainbars = to_si(Mainbar, data['rebars']['main'], self.unit)
+            self.mainbars.length = self.data.height
+            self.stirups = to_si(Stirup, data['rebars']['stirup'], self.unit)
 
     def set_unit_system(self, unit): 
         ''' Establish or convert the system of measurement units'''       
-        self.units = Library().set_unit_system(unit)
+        self.unit = unit or SI
+        self.units = catalog.units(self.unit)
+
+    def specs(self):
+        ''' Rebar specs the member quantities depend on.'''
+        return [self.mainbars, self.stirups]
+
+    def inputs(self):
+        ''' Snapshot of the model fields and rebar specs the cached report depends on.'''
+        return state(self.unit, self.data, *self.specs())
     
     @property
     def concrete_type(self):
@@ -223,70 +246,54 @@ class RCColumn:
 
     @property
     def bredth(self):
-        return {'value': self.data.bredth, 'unit': self.units.get('length')}
+        return present(self.data.bredth, 'length', self.unit)
 
     @property
     def width(self):
-        return {'value': self.data.width, 'unit': self.units.get('length')}
+        return present(self.data.width, 'length', self.unit)
 
     @property
     def height(self):
-        return {'value': self.data.height, 'unit': self.units.get('length')}
+        return present(self.data.height, 'length', self.unit)
+
+    @property
+    def formwork_area(self):
+        ''' Formwork in m2 '''
+        return self.data.surface * self.data.amt
 
     @property
     def formwork(self):
-        return {"value": round(self.data.surface * self.data.amt,2), "unit": self.units.get('area')}
+        return present(self.formwork_area, 'area', self.unit, 2)
+
+    @property
+    def dry_volume(self):
+        return self.data.volume * self.data.amt
 
     @property
     def concrete(self):
-        dry_vol = self.data.volume * self.data.amt
-        data = Library().concrete_types.get(self.concrete_type)
-        legend = Library().concrete_types.get('legend')
-        wet_volume_factor = legend.get("wet_volume_factor")
-        bag_weight = legend.get("bag_weight")
-        
-        report = {
-           'dry_volume': {'value': dry_vol, 'unit': self.units.get('volume')},
-           "wet_volume":  {'value': dry_vol * wet_volume_factor,  'unit': self.units.get('volume')},
-           "cement": {'value': round(data.get('material').get('cement')[0] * dry_vol,3), 'unit': 'kg',
-                      "bag": {'value': 0, 'unit': 'bag'}
-                      },
-           "fine_agg": {'value': round(data.get('material').get('fine_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "course_agg": {'value': round(data.get('material').get('course_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "water": {'value': round(data.get('material').get('water',(190, 'liter'))[0] * dry_vol,3), 'unit': 'liters'}
-        }
-        report['cement']['bag']['value'] = round((report['cement']['value'] / bag_weight[0]) + 0.5)
-        return report
+        return member_concrete(self.dry_volume, self.concrete_type, self.unit)
         
+    def bar_groups(self):
+        ''' Cut bars of every column as BarGroup tuples.'''
+        return [
+            BarGroup('main', self.mainbars.type, 'straight', self.mainbars.length, self.mainbars.amt * self.data.amt),
+            BarGroup('stirups', self.stirups.type, 'stirrup', self.stirups.length, self.stirups.stirups.get('total') * self.data.amt)
+        ]
+
     @property
     def rebars(self):
-        exclude = { "clm_width": True, "clm_bredth": True, "clm_height": True }
-        if not self.stirups.span or not self.stirups.support_spacing:
-            exclude["span"] = True
-            exclude["support_spacing"] = True
-        main_bars = json.loads(json.dumps(self.mainbars.bars))
-        stirups = json.loads(json.dumps(self.stirups.bars))
-        main_bars['rebars']['value'] = self.mainbars.bars['rebars']['value'] * self.data.amt # calucale the total amount of bars
-        main_bars['weight']['value'] = self.mainbars.bars['weight']['value'] * self.data.amt
-
-        stirups['rebars']['value'] = self.stirups.bars['rebars']['value'] * self.data.amt # calucale the total amount of bars
-        stirups['weight']['value'] = self.stirups.bars['weight']['value'] * self.data.amt
-        main_bars['data'] = self.mainbars.model_dump()
-        stirups['data'] = self.stirups.model_dump(exclude=exclude)
-        stirups['data']['cut_length'] = round(self.stirups.length,2)
-        stirups['data']['amount'] = self.stirups.stirups.get('total')
-        
-        
+        stirups = self.stirups.stirups
         return {
-            'main': main_bars,
-            'stirups': stirups            
+            'main': bar_group(self.mainbars, self.unit, self.data.amt),
+            'stirups': bar_group(self.stirups, self.unit, self.data.amt, stirup_exclude(self.stirups),
+                                 cut_length=round(stirups.get('length'),2), amount=stirups.get('total'))
         }
 
-    @property
+    @cached
     def report(self):
         
         return {
-        "column": self.data.model_dump(),         
+        "column": present_record(Column, self.data.as_dict(), self.unit),         
         "rebars": self.rebars,     
         "formwork": self.formwork,
         "concrete": self.concrete
@@ -296,21 +303,31 @@ class RCColumn:
 
 class RCBeam:
     """ Reinforced Concrete Beam """
+    category = 'beam'
     def __init__(self, data:dict=None):
         
         if data:
-            self.data = Beam( **data )           
-            self.mainbars = Mainbar( **data['rebars']['main'])           
-            self.stirups = Stirup( **data['rebars']['stirup']) 
+            self.set_unit_system(data.get('unit'))
+            self.data = BeamRecord.from_model(to_si(Beam, data, self.unit))
+            self.mainbars = to_si(Mainbar, data['rebars']['main'], self.unit)
+            self.stirups = to_si(Stirup, data['rebars']['stirup'], self.unit)
             if len(data['rebars'].get('extra'))  > 0:
-                self.extrabars = Mainbar( **data['rebars']['extra'])      
+                self.extrabars = to_si(Mainbar, data['rebars']['extra'], self.unit)
             else: 
                 self.extrabars = None       
-            self.set_unit_system(self.data.unit)
 
     def set_unit_system(self, unit): 
         ''' Establish or convert the system of measurement units'''       
-        self.units = Library().set_unit_system(unit)
+        self.unit = unit or SI
+        self.units = catalog.units(self.unit)
+
+    def specs(self):
+        ''' Rebar specs the member quantities depend on.'''
+        return [self.mainbars, self.stirups, self.extrabars]
+
+    def inputs(self):
+        ''' Snapshot of the model fields and rebar specs the cached report depends on.'''
+        return state(self.unit, self.data, *self.specs())
     
     @property
     def concrete_type(self):
@@ -322,76 +339,56 @@ class RCBeam:
 
     @property
     def depth(self):
-        return {'value': self.data.depth, 'unit': self.units.get('length')}
+        return present(self.data.depth, 'length', self.unit)
 
     @property
     def width(self):
-        return {'value': self.data.width, 'unit': self.units.get('length')}
+        return present(self.data.width, 'length', self.unit)
 
     @property
     def length(self):
-        return {'value': self.data.length, 'unit': self.units.get('length')}
+        return present(self.data.length, 'length', self.unit)
+
+    @property
+    def formwork_area(self):
+        ''' Formwork in m2 '''
+        return self.data.surface * self.data.amt
 
     @property
     def formwork(self):
-        return {"value": round(self.data.surface * self.data.amt,2), "unit": self.units.get('area')}
+        return present(self.formwork_area, 'area', self.unit, 2)
+
+    @property
+    def dry_volume(self):
+        return self.data.volume * self.data.amt
 
     @property
     def concrete(self):
-        dry_vol = self.data.volume * self.data.amt
-        data = Library().concrete_types.get(self.concrete_type)
-        legend = Library().concrete_types.get('legend')
-        wet_volume_factor = legend.get("wet_volume_factor")
-        bag_weight = legend.get("bag_weight")        
-        report = {
-           'dry_volume': {'value': dry_vol, 'unit': self.units.get('volume')},
-           "wet_volume":  {'value': dry_vol * wet_volume_factor,  'unit': self.units.get('volume')},
-           "cement": {'value': round(data.get('material').get('cement')[0] * dry_vol,3), 'unit': 'kg',
-                      "bag": {'value': 0, 'unit': 'bag'}
-                      },
-           "fine_agg": {'value': round(data.get('material').get('fine_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "course_agg": {'value': round(data.get('material').get('course_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "water": {'value': round(data.get('material').get('water',(190, 'liter'))[0] * dry_vol,3), 'unit': 'liters'}
-        }
-        report['cement']['bag']['value'] = round((report['cement']['value'] / bag_weight[0]) + 0.5)
-        return report
+        return member_concrete(self.dry_volume, self.concrete_type, self.unit)
         
+    def bar_groups(self):
+        ''' Cut bars of every beam as BarGroup tuples.'''
+        groups = [ BarGroup('main', self.mainbars.type, 'straight', self.mainbars.length, self.mainbars.amt * self.data.amt) ]
+        if self.extrabars:
+            groups.append(BarGroup('extra', self.extrabars.type, 'straight', self.extrabars.length, self.extrabars.amt * self.data.amt))
+        groups.append(BarGroup('stirups', self.stirups.type, 'stirrup', self.stirups.length, self.stirups.stirups.get('total') * self.data.amt))
+        return groups
+
     @property
     def rebars(self):
-        exclude = { "clm_width": True, "clm_bredth": True, "clm_height": True }
-        if not self.stirups.span or not self.stirups.support_spacing:
-            exclude["span"] = True
-            exclude["support_spacing"] = True
-        main_bars = json.loads(json.dumps(self.mainbars.bars))
-        stirups = json.loads(json.dumps(self.stirups.bars))
-        if self.extrabars:
-            extra_bars = json.loads(json.dumps(self.extrabars.bars))
-            extra_bars['rebars']['value'] = self.extrabars.bars['rebars']['value'] * self.data.amt # calucale the total amount of bars
-            extra_bars['weight']['value'] = self.extrabars.bars['weight']['value'] * self.data.amt
-            extra_bars['data'] = self.extrabars.model_dump()
-        else:
-            extra_bars = None
-        main_bars['rebars']['value'] = self.mainbars.bars['rebars']['value'] * self.data.amt # calucale the total amount of bars
-        main_bars['weight']['value'] = self.mainbars.bars['weight']['value'] * self.data.amt
-        stirups['rebars']['value'] = self.stirups.bars['rebars']['value'] * self.data.amt # calucale the total amount of bars
-        stirups['weight']['value'] = self.stirups.bars['weight']['value'] * self.data.amt
-        main_bars['data'] = self.mainbars.model_dump()
-        stirups['data'] = self.stirups.model_dump(exclude=exclude)
-        stirups['data']['cut_length'] = round(self.stirups.length,2)
-        stirups['data']['amount'] = self.stirups.stirups.get('total')
-        
-        
+        stirups = self.stirups.stirups
         return {
-            'main': main_bars,
-            'extra': extra_bars,
-            'stirups': stirups            
+            'main': bar_group(self.mainbars, self.unit, self.data.amt),
+            'extra': bar_group(self.extrabars, self.unit, self.data.amt) if self.extrabars else None,
+            'stirups': bar_group(self.stirups, self.unit, self.data.amt, stirup_exclude(self.stirups),
+                                 cut_length=round(stirups.get('length'),2), amount=stirups.get('total'))
         }
 
-    @property
+    @cached
     def report(self):
         
         return {
-        "beam": self.data.model_dump(),         
+        "beam": present_record(Beam, self.data.as_dict(), self.unit),         
         "rebars": self.rebars,     
         "formwork": self.formwork,
         "concrete": self.concrete
@@ -399,7 +396,8 @@ class RCBeam:
 
 
 class StripFooting(BaseModel):
-    id:str    
+    lengths:ClassVar[tuple] = ('width', 'depth', 'length', 'excavation_depth')
+    id:str
     unit:str | None = None
     width:float
     depth:float
@@ -418,17 +416,27 @@ class StripFooting(BaseModel):
     
 class Foundation:
     """ Reinforced Concrete Foundation """
+    category = 'foundation'
     def __init__(self, data:dict=None):
         
         if data:
-            self.data = StripFooting( **data )           
-            self.mainbars = Mainbar( **data['rebars']['main'])           
-            self.links = Links( **data['rebars']['links']) 
-            self.set_unit_system(self.data.unit)
+            self.set_unit_system(data.get('unit'))
+            self.data = FootingRecord.from_model(to_si(StripFooting, data, self.unit))
+            self.mainbars = to_si(Mainbar, data['rebars']['main'], self.unit)
+            self.links = to_si(Links, data['rebars']['links'], self.unit)
 
     def set_unit_system(self, unit): 
         ''' Establish or convert the system of measurement units'''       
-        self.units = Library().set_unit_system(unit)
+        self.unit = unit or SI
+        self.units = catalog.units(self.unit)
+
+    def specs(self):
+        ''' Rebar specs the member quantities depend on.'''
+        return [self.mainbars, self.links]
+
+    def inputs(self):
+        ''' Snapshot of the model fields and rebar specs the cached report depends on.'''
+        return state(self.unit, self.data, *self.specs())
     
     @property
     def concrete_type(self):
@@ -436,76 +444,60 @@ class Foundation:
     
     @property
     def depth(self):
-        return {'value': self.data.depth, 'unit': self.units.get('length')}
+        return present(self.data.depth, 'length', self.unit)
     
     @property
     def excavation_depth(self):
-        return {'value': self.data.excavation_depth, 'unit': self.units.get('length')}
+        return present(self.data.excavation_depth, 'length', self.unit)
 
     @property
     def width(self):
-        return {'value': self.data.width, 'unit': self.units.get('length')}
+        return present(self.data.width, 'length', self.unit)
     
     @property
     def length(self):
-        return {'value': self.data.length, 'unit': self.units.get('length')}    
+        return present(self.data.length, 'length', self.unit)    
 
     @property
     def volume(self):
-        return {'value': self.data.volume, 'unit': self.units.get('volume')}
+        return present(self.data.volume, 'volume', self.unit)
     
     @property
     def excavation(self):
-        return {'value': self.data.excavation, 'unit': self.units.get('volume')}
+        return present(self.data.excavation, 'volume', self.unit)
     
     @property
     def back_fill(self):
-        return {'value': self.data.excavation - self.data.volume, 'unit': self.units.get('volume')}
+        return present(self.data.excavation - self.data.volume, 'volume', self.unit)
     
 
+    @property
+    def dry_volume(self):
+        return self.data.volume
+
     @property
     def concrete(self):
-        dry_vol = self.data.volume 
-        data = Library().concrete_types.get(self.concrete_type)
-        legend = Library().concrete_types.get('legend')
-        wet_volume_factor = legend.get("wet_volume_factor")
-        bag_weight = legend.get("bag_weight")        
-        report = {
-           'dry_volume': {'value': dry_vol, 'unit': self.units.get('volume')},
-           "wet_volume":  {'value': dry_vol * wet_volume_factor,  'unit': self.units.get('volume')},
-           "cement": {'value': round(data.get('material').get('cement')[0] * dry_vol,3), 'unit': 'kg',
-                      "bag": {'value': 0, 'unit': 'bag'}
-                      },
-           "fine_agg": {'value': round(data.get('material').get('fine_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "course_agg": {'value': round(data.get('material').get('course_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "water": {'value': round(data.get('material').get('water',(190, 'liter'))[0] * dry_vol,3), 'unit': 'liters'}
-        }
-        report['cement']['bag']['value'] = round((report['cement']['value'] / bag_weight[0]) + 0.5)
-        return report
+        return member_concrete(self.dry_volume, self.concrete_type, self.unit)
         
+    def bar_groups(self):
+        ''' Cut bars of the footing as BarGroup tuples.'''
+        return [
+            BarGroup('main', self.mainbars.type, 'straight', self.mainbars.length, self.mainbars.amt),
+            BarGroup('links', self.links.type, 'link', self.links.length, self.links.link.get('total'))
+        ]
+
     @property
     def rebars(self):
-        exclude = { "ftn_width": True, "ftn_length": True }        
-        main_bars = json.loads(json.dumps(self.mainbars.bars))
-        links = json.loads(json.dumps(self.links.bars))        
-        main_bars['rebars']['value'] = self.mainbars.bars['rebars']['value'] # calucale the total amount of bars
-        main_bars['weight']['value'] = self.mainbars.bars['weight']['value'] 
-        links['rebars']['value'] = self.links.bars['rebars']['value']  # calucale the total amount of bars
-        links['weight']['value'] = self.links.bars['weight']['value'] 
-        main_bars['data'] = self.mainbars.model_dump()
-        links['data'] = self.links.model_dump(exclude=exclude)
-        links['data']['cut_length'] = round(self.links.length,2)
-        links['data']['amount'] = self.links.link.get('total')
-        
-        
+        link = self.links.link
         return {
-            'main': main_bars,           
-            'links': links            
+            'main': bar_group(self.mainbars, self.unit),
+            'links': bar_group(self.links, self.unit, exclude={ "ftn_width": True, "ftn_length": True },
+                               cut_length=round(link.get('length'),2), amount=link.get('total'))
         }
 
-    @property
+    @cached
     def report(self):  
-        foundation = self.data.model_dump()
+        foundation = present_record(StripFooting, self.data.as_dict(), self.unit)
         foundation['excavation'] = self.excavation
         foundation['backfill'] = self.back_fill
         return {
@@ -517,7 +509,8 @@ class Foundation:
 
 
 class SuspendedSlab(BaseModel):
-    id:str   
+    lengths:ClassVar[tuple] = ('width', 'depth', 'length')
+    id:str
     unit:str | None = None
     width:float
     depth:float
@@ -539,44 +532,45 @@ class SuspendedSlab(BaseModel):
    
 class Slab:
     """ Reinforced Concrete Slab """
+    category = 'slab'
     def __init__(self, data:dict=None):
         
         if data:
-            self.data = SuspendedSlab( **data )           
-            self.mainbars = Mainbar( **data['rebars']['main'])           
-            self.distribution = Mainbar( **data['rebars']['dist']) 
-            self.set_unit_system(self.data.unit)
+            self.set_unit_system(data.get('unit'))
+            self.data = SlabRecord.from_model(to_si(SuspendedSlab, data, self.unit))
+            self.mainbars = to_si(Mainbar, data['rebars']['main'], self.unit)
+            self.distribution = to_si(Mainbar, data['rebars']['dist'], self.unit)
+            omain = si_record(Mainbar, data['rebars']['omain'], self.unit)
+            odist = si_record(Mainbar, data['rebars']['odist'], self.unit)
             # calculate oversupport bars lengths
             omain_1 = self.mainbars.length * self.data.span 
             omain_2 = self.distribution.length * self.data.span 
             odist_1 = self.distribution.length - ( omain_2 *2 )
             odist_2 = self.mainbars.length - ( omain_1 * 2 )
             # calculate amount
-            omain_1_amt = odist_1 / float(data['rebars']['omain']['spacing'])
-            omain_2_amt = odist_2 / float(data['rebars']['omain']['spacing'])
-            odist_1_amt = omain_1 / float(data['rebars']['odist']['spacing'])
-            odist_2_amt = omain_2 / float(data['rebars']['odist']['spacing'])
-            om1 = json.loads(json.dumps(data['rebars']['omain']))
-            om2 = json.loads(json.dumps(data['rebars']['omain']))
-            od1 = json.loads(json.dumps(data['rebars']['odist']))
-            od2 = json.loads(json.dumps(data['rebars']['odist']))
-            om1['length'] = omain_1
-            om1['amt'] = int(omain_1_amt * 2)
-            om2['length'] = omain_2
-            om2['amt'] = int(omain_2_amt * 2)
-            od1['length'] = odist_1
-            od1['amt'] = int(odist_1_amt * 2 )
-            od2['length'] = odist_2
-            od2['amt'] = int(odist_2_amt * 2 )
-            self.temperature_bar_1 = Mainbar( **om1 )
-            self.temperature_bar_2 = Mainbar( **om2 )
-            self.anticrack_bar_1 = Mainbar( **od1 )
-            self.anticrack_bar_2 = Mainbar( **od2 )
+            omain_1_amt = odist_1 / float(omain['spacing'])
+            omain_2_amt = odist_2 / float(omain['spacing'])
+            odist_1_amt = omain_1 / float(odist['spacing'])
+            odist_2_amt = omain_2 / float(odist['spacing'])
+            self.temperature_bar_1 = Mainbar( **dict(omain, length=omain_1, amt=int(omain_1_amt * 2)) )
+            self.temperature_bar_2 = Mainbar( **dict(omain, length=omain_2, amt=int(omain_2_amt * 2)) )
+            self.anticrack_bar_1 = Mainbar( **dict(odist, length=odist_1, amt=int(odist_1_amt * 2)) )
+            self.anticrack_bar_2 = Mainbar( **dict(odist, length=odist_2, amt=int(odist_2_amt * 2)) )
 
             
     def set_unit_system(self, unit): 
         ''' Establish or convert the system of measurement units'''       
-        self.units = Library().set_unit_system(unit)
+        self.unit = unit or SI
+        self.units = catalog.units(self.unit)
+
+    def specs(self):
+        ''' Rebar specs the member quantities depend on.'''
+        return [self.mainbars, self.distribution, self.temperature_bar_1,
+                self.temperature_bar_2, self.anticrack_bar_1, self.anticrack_bar_2]
+
+    def inputs(self):
+        ''' Snapshot of the model fields and rebar specs the cached report depends on.'''
+        return state(self.unit, self.data, *self.specs())
     
     @property
     def concrete_type(self):
@@ -584,97 +578,66 @@ class Slab:
     
     @property
     def depth(self):
-        return {'value': self.data.depth, 'unit': self.units.get('length')}
+        return present(self.data.depth, 'length', self.unit)
     
     
 
     @property
     def width(self):
-        return {'value': self.data.width, 'unit': self.units.get('length')}
+        return present(self.data.width, 'length', self.unit)
     
     @property
     def length(self):
-        return {'value': self.data.length, 'unit': self.units.get('length')}    
+        return present(self.data.length, 'length', self.unit)    
 
     @property
     def volume(self):
-        return {'value': self.data.volume, 'unit': self.units.get('volume')}
+        return present(self.data.volume, 'volume', self.unit)
+
+    @property
+    def formwork_area(self):
+        ''' Formwork in m2 '''
+        return self.data.surface
 
     @property
     def formwork(self):
-        return {'value': self.data.surface, 'unit': self.units.get('area')}
+        return present(self.formwork_area, 'area', self.unit)
     
     
 
+    @property
+    def dry_volume(self):
+        return self.data.volume
+
     @property
     def concrete(self):
-        dry_vol = self.data.volume 
-        data = Library().concrete_types.get(self.concrete_type)
-        legend = Library().concrete_types.get('legend')
-        wet_volume_factor = legend.get("wet_volume_factor")
-        bag_weight = legend.get("bag_weight")        
-        report = {
-           'dry_volume': {'value': dry_vol, 'unit': self.units.get('volume')},
-           "wet_volume":  {'value': dry_vol * wet_volume_factor,  'unit': self.units.get('volume')},
-           "cement": {'value': round(data.get('material').get('cement')[0] * dry_vol,3), 'unit': 'kg',
-                      "bag": {'value': 0, 'unit': 'bag'}
-                      },
-           "fine_agg": {'value': round(data.get('material').get('fine_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "course_agg": {'value': round(data.get('material').get('course_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "water": {'value': round(data.get('material').get('water',(190, 'liter'))[0] * dry_vol,3), 'unit': 'liters'}
-        }
-        report['cement']['bag']['value'] = round((report['cement']['value'] / bag_weight[0]) + 0.5)
-        return report
+        return member_concrete(self.dry_volume, self.concrete_type, self.unit)
         
+    def bar_groups(self):
+        ''' Cut bars of the slab as BarGroup tuples.'''
+        return [
+            BarGroup(mark, rebar.type, 'straight', rebar.length, rebar.amt)
+            for mark, rebar in (
+                ('main', self.mainbars), ('distribution', self.distribution),
+                ('temp_bars1', self.temperature_bar_1), ('temp_bars2', self.temperature_bar_2),
+                ('ac_bars1', self.anticrack_bar_1), ('ac_bars2', self.anticrack_bar_2)
+            )
+        ]
+
     @property
     def rebars(self):
-               
-        main_bars = json.loads(json.dumps(self.mainbars.bars))
-        dist_bars = json.loads(json.dumps(self.distribution.bars))  
-        temp_bars1 = json.loads(json.dumps(self.temperature_bar_1.bars))  
-        temp_bars2 = json.loads(json.dumps(self.temperature_bar_2.bars)) 
-        ac_bars1 = json.loads(json.dumps(self.anticrack_bar_1.bars))  
-        ac_bars2 = json.loads(json.dumps(self.anticrack_bar_2.bars)) 
-
-
-        main_bars['rebars']['value'] = self.mainbars.bars['rebars']['value'] # calucale the total amount of bars
-        main_bars['weight']['value'] = self.mainbars.bars['weight']['value'] 
-        dist_bars['rebars']['value'] = self.distribution.bars['rebars']['value']  # calucale the total amount of bars
-        dist_bars['weight']['value'] = self.distribution.bars['weight']['value'] 
-        temp_bars1['rebars']['value'] = self.temperature_bar_1.bars['rebars']['value'] # calucale the total amount of bars
-        temp_bars1['weight']['value'] = self.temperature_bar_1.bars['weight']['value'] 
-        temp_bars2['rebars']['value'] = self.temperature_bar_2.bars['rebars']['value'] # calucale the total amount of bars
-        temp_bars2['weight']['value'] = self.temperature_bar_2.bars['weight']['value'] 
-        ac_bars1['rebars']['value'] = self.anticrack_bar_1.bars['rebars']['value'] # calucale the total amount of bars
-        ac_bars1['weight']['value'] = self.anticrack_bar_1.bars['weight']['value'] 
-        ac_bars2['rebars']['value'] = self.anticrack_bar_2.bars['rebars']['value'] # calucale the total amount of bars
-        ac_bars2['weight']['value'] = self.anticrack_bar_2.bars['weight']['value'] 
-       
-       
-        main_bars['data'] = self.mainbars.model_dump()
-        dist_bars['data'] = self.distribution.model_dump()
-        temp_bars1['data'] = self.temperature_bar_1.model_dump()
-        temp_bars2['data'] = self.temperature_bar_2.model_dump()
-        ac_bars1['data'] = self.anticrack_bar_1.model_dump()
-        ac_bars2['data'] = self.anticrack_bar_2.model_dump()
-        
-        
-        
-        
         return {
-            'main': main_bars,           
-            'distribution': dist_bars,
-            'temp_bars1': temp_bars1,
-            'temp_bars2': temp_bars2,
-            'ac_bars1': ac_bars1,
-            'ac_bars2': ac_bars2
-
-
+            'main': bar_group(self.mainbars, self.unit),
+            'distribution': bar_group(self.distribution, self.unit),
+            'temp_bars1': bar_group(self.temperature_bar_1, self.unit),
+            'temp_bars2': bar_group(self.temperature_bar_2, self.unit),
+            'ac_bars1': bar_group(self.anticrack_bar_1, self.unit),
+            'ac_bars2': bar_group(self.anticrack_bar_2, self.unit)
         }
 
-    @property
+    @cached
     def report(self):  
-        slab = self.data.model_dump()        
+        slab = present_record(SuspendedSlab, self.data.as_dict(), self.unit)        
         return {
         "slab": slab,  
         "formwork": self.formwork,       
@@ -684,7 +647,8 @@ class Slab:
 
 
 class Floor(BaseModel):
-    id:str   
+    lengths:ClassVar[tuple] = ('width', 'depth', 'length')
+    id:str
     unit:str | None = None
     width:float
     depth:float
@@ -704,13 +668,23 @@ class Floor(BaseModel):
 
 class ConcreteFloor:
     """ Concrete Floor """
+    category = 'slab'
     def __init__(self, data:dict=None):
-        self.data = Floor( **data ) 
-        self.set_unit_system(self.data.unit)
+        self.set_unit_system(data.get('unit'))
+        self.data = FloorRecord.from_model(to_si(Floor, data, self.unit))
     
     def set_unit_system(self, unit): 
         ''' Establish or convert the system of measurement units'''       
-        self.units = Library().set_unit_system(unit)
+        self.unit = unit or SI
+        self.units = catalog.units(self.unit)
+
+    def specs(self):
+        ''' Floors have no rebar specs, the mesh is part of the record.'''
+        return []
+
+    def inputs(self):
+        ''' Snapshot of the model fields and rebar specs the cached report depends on.'''
+        return state(self.unit, self.data)
     
     @property
     def concrete_type(self):
@@ -718,44 +692,36 @@ class ConcreteFloor:
     
     @property
     def depth(self):
-        return {'value': self.data.depth, 'unit': self.units.get('length')}
+        return present(self.data.depth, 'length', self.unit)
 
     @property
     def width(self):
-        return {'value': self.data.width, 'unit': self.units.get('length')}
+        return present(self.data.width, 'length', self.unit)
     
     @property
     def length(self):
-        return {'value': self.data.length, 'unit': self.units.get('length')}    
+        return present(self.data.length, 'length', self.unit)    
 
     @property
     def area(self):
-        return {'value': self.data.surface, 'unit': self.units.get('area')}
+        return present(self.data.surface, 'area', self.unit)
     
     @property
     def volume(self):
-        return {'value': self.data.volume, 'unit': self.units.get('volume')}
+        return present(self.data.volume, 'volume', self.unit)
     
+    @property
+    def dry_volume(self):
+        return self.data.volume
+
     @property
     def concrete(self):
-        dry_vol = self.data.volume 
-        data = Library().concrete_types.get(self.concrete_type)
-        legend = Library().concrete_types.get('legend')
-        wet_volume_factor = legend.get("wet_volume_factor")
-        bag_weight = legend.get("bag_weight")        
-        report = {
-           'dry_volume': {'value': dry_vol, 'unit': self.units.get('volume')},
-           "wet_volume":  {'value': dry_vol * wet_volume_factor,  'unit': self.units.get('volume')},
-           "cement": {'value': round(data.get('material').get('cement')[0] * dry_vol,3), 'unit': 'kg',
-                      "bag": {'value': 0, 'unit': 'bag'}
-                      },
-           "fine_agg": {'value': round(data.get('material').get('fine_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "course_agg": {'value': round(data.get('material').get('course_agg')[0] * dry_vol,3), 'unit': 'kg'},
-           "water": {'value': round(data.get('material').get('water',(190, 'liter'))[0] * dry_vol,3), 'unit': 'liters'}
-        }
-        report['cement']['bag']['value'] = round((report['cement']['value'] / bag_weight[0]) + 0.5)
-        return report
+        return member_concrete(self.dry_volume, self.concrete_type, self.unit)
     
+    def bar_groups(self):
+        ''' Floors are reinforced with fabric mesh, there are no cut bars.'''
+        return []
+
     @property
     def reinforcement(self):
         return {
@@ -763,11 +729,11 @@ class ConcreteFloor:
             'area': self.area
         }    
 
-    @property
+    @cached
     def report(self):  
-        floor = self.data.model_dump()        
+        floor = present_record(Floor, self.data.as_dict(), self.unit)
         return {
-        "floor": self.data.model_dump(),               
+        "floor": floor,               
         "reinforcement": self.reinforcement,        
         "concrete": self.concrete
         }
@@ -819,6 +785,35 @@ def test_foundation():
     fdn = Foundation( data=cdata )    
     print('FOUNDATION REPORT', fdn.report)
 
+def bench_rebar_reports(reports:int=500):
+    ''' Time and peak allocation of building a member and its rebar report.'''
+    import time, tracemalloc
+    slab = dict(id='S1', width=4.0, depth=0.15, length=6.0, span=0.25, unit='m', ctype='m25')
+    slab['rebars'] = {
+        "main": {"type": "m12", "unit": "m", "length": 4.0, "amt": 30},
+        "dist": {"type": "m10", "unit": "m", "length": 6.0, "amt": 20},
+        "omain": {"type": "m12", "unit": "m", "spacing": 0.2},
+        "odist": {"type": "m10", "unit": "m", "spacing": 0.3}
+    }
+    column = dict(id='C121', height=6.8, width=.402, bredth=.45, amt=5, unit='m', ctype='m15')
+    column['rebars'] = {
+        "main": {"type": "m16", "unit": "m", "length": 4.5, "amt": 4},
+        "stirup": {"type": "m10", "spacing": 0.25, "clm_width": .402, "clm_bredth": .45,
+                   "clm_height": 6.8, "span": 0.25, "support_spacing": 0.11, "unit": "m"}
+    }
+    for name, build in (("column", lambda: RCColumn(column).rebars), ("slab", lambda: Slab(slab).rebars)):
+        build()
+        tracemalloc.start()
+        build()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for _ in range(reports):
+            build()
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / reports * 1e6:.1f}us and {peak} bytes peak allocation per member rebar report")
+
+
 if __name__ == '__main__':
     #test_rccColumn()
     test_foundation()
\ No newline at end of file
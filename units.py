@@ -0,0 +1,176 @@
+# units.py
+import numpy as np
+
+try:
+    from catalog import catalog
+except:
+    from modules.Estimate.catalog import catalog
+
+
+LENGTH_UNITS:tuple = ('mm', 'm', 'ft')
+METRES = np.array([0.001, 1.0, 0.3048]) # Metres per length unit
+FACTORS = METRES[:, None] / METRES[None, :] # FACTORS[source, target] converts a length
+FACTORS.setflags(write=False)
+POWERS:dict = {'length': 1, 'area': 2, 'volume': 3}
+KG_PER_LB = 0.45359237
+SI = 'm' # Internal unit system of the compute core
+
+
+def unit_index(unit:str=None):
+    ''' Row of the factor matrix for a unit system set up by Library.set_unit_system.'''
+    usystem = catalog.units(unit)
+    if not usystem:
+        raise ValueError(f"Unknown unit system {unit!r}")
+    return LENGTH_UNITS.index(usystem.get('length'))
+
+
+def factor(source:str=None, target:str=None, dimension:str='length'):
+    ''' Multiplier converting a length, area or volume from one unit system to another.'''
+    return float(FACTORS[unit_index(source), unit_index(target)] ** POWERS[dimension])
+
+
+def crosses_system(source:str=None, target:str=None):
+    ''' True when a conversion goes between metric and imperial bar sizes.'''
+    return (source == 'ft') != (target == 'ft')
+
+
+def read(record, field:str=None):
+    if isinstance(record, dict):
+        return record.get(field)
+    return getattr(record, field, None)
+
+
+def convert_record(record, source:str=None, target:str=None, lengths:tuple=(), areas:tuple=(),
+                   volumes:tuple=(), bars:tuple=(), digits:int=None):
+    ''' Converts the listed fields of one record (dict or model) between unit systems.
+        Returns a dict of the converted values, fields that are None are left out.
+    '''
+    values = {}
+    for dimension, fields in (('length', lengths), ('area', areas), ('volume', volumes)):
+        multiplier = factor(source, target, dimension)
+        for field in fields:
+            value = read(record, field)
+            if value is not None:
+                value = value * multiplier
+                values[field] = round(value, digits) if digits is not None else value
+    if crosses_system(source, target):
+        for field in bars:
+            if read(record, field) is not None:
+                values[field] = catalog.convert_bar(read(record, field))
+    return values
+
+
+def convert_records(records:list=None, source:str=None, target:str=None, lengths:tuple=(), areas:tuple=(),
+                    volumes:tuple=(), bars:tuple=(), digits:int=None):
+    ''' Converts a list of dict records in one array operation per field.
+        Returns new records with unit set to the target system.
+    '''
+    converted = [ dict(record, unit=target) for record in records ]
+    for dimension, fields in (('length', lengths), ('area', areas), ('volume', volumes)):
+        multiplier = factor(source, target, dimension)
+        for field in fields:
+            column = np.array([ record.get(field) for record in records ], dtype=float) * multiplier
+            if digits is not None:
+                column = np.round(column, digits)
+            for record, value in zip(converted, column.tolist()):
+                if value == value: # None becomes nan and is left out
+                    record[field] = value
+    if crosses_system(source, target):
+        for field in bars:
+            for record in converted:
+                if record.get(field) is not None:
+                    record[field] = catalog.convert_bar(record[field])
+    return converted
+
+
+def convert_table(table, source:str=None, target:str=None, lengths:tuple=(), areas:tuple=(),
+                  volumes:tuple=(), digits:int=None):
+    ''' Converts the listed fields of a NumPy structured array, returns a converted copy.'''
+    converted = table.copy()
+    for dimension, fields in (('length', lengths), ('area', areas), ('volume', volumes)):
+        multiplier = factor(source, target, dimension)
+        for field in fields:
+            converted[field] = converted[field] * multiplier
+            if digits is not None:
+                converted[field] = np.round(converted[field], digits)
+    return converted
+
+
+# -- Ingestion and presentation -----
+
+def si_record(model, data:dict=None, unit:str=None):
+    ''' Returns a copy of caller data with the model's length fields in metres.
+        unit is used when the data does not carry its own.
+    '''
+    unit = data.get('unit') or unit or SI
+    values = dict(data, unit=SI)
+    if unit != SI:
+        values.update(convert_record(data, unit, SI, lengths=model.lengths))
+    return values
+
+
+def to_si(model, data:dict=None, unit:str=None):
+    ''' Ingestion stage, validates caller data into a model held in SI units.'''
+    return model( **si_record(model, data, unit) )
+
+
+def present(value:float=None, dimension:str='length', unit:str=SI, digits:int=None):
+    ''' Converts an SI length, area or volume to the caller's unit system for reporting.'''
+    if unit != SI:
+        value = value * factor(SI, unit, dimension)
+    return {'value': round(value, digits) if digits is not None else value, 'unit': catalog.units(unit).get(dimension)}
+
+
+def present_weight(kg:float=None, unit:str=SI, digits:int=3):
+    ''' Reports a mass in kg for metric callers and lb for imperial ones.'''
+    if unit == 'ft':
+        return {'value': round(kg / KG_PER_LB, digits), 'unit': 'lb'}
+    return {'value': round(kg, digits), 'unit': 'kg'}
+
+
+def present_record(model, record:dict=None, unit:str=SI, digits:int=6):
+    ''' Converts the length fields of a dumped SI model back to the caller's unit system.'''
+    if unit == SI:
+        return record
+    values = convert_record(record, SI, unit, lengths=model.lengths, digits=digits)
+    return dict(record, unit=unit, **values)
+
+
+def present_bars(model, group:dict=None, unit:str=SI):
+    ''' Converts a rebar group report (rebars, weight, data) from SI to the caller's unit system.'''
+    if unit == SI:
+        return group
+    group['weight'] = present_weight(group['weight']['value'], unit)
+    group['data'] = present_record(model, group['data'], unit)
+    return group
+
+
+def bench_units(records:int=100_000):
+    import time
+    rng = np.random.default_rng(1)
+    spacings = ('b0_spacing', 'b1_spacing', 'b2_spacing', 't0_spacing', 't1_spacing', 't2_spacing')
+    bars = ('b0', 'b1', 'b2', 't0', 't1', 't2')
+    rows = [
+        dict({ field: float(value) for field, value in zip(spacings, rng.uniform(100, 400, 6)) },
+             unit='mm', length=float(rng.uniform(2000, 9000)), width=float(rng.uniform(2000, 6000)),
+             **{ bar: 'm12' for bar in bars })
+        for _ in range(records)
+    ]
+    start = time.perf_counter()
+    for row in rows:
+        convert_record(row, 'mm', 'ft', lengths=spacings + ('length', 'width'), bars=bars, digits=2)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    convert_records(rows, 'mm', 'ft', lengths=spacings + ('length', 'width'), bars=bars, digits=2)
+    batch = time.perf_counter() - start
+    table = np.zeros(records, dtype=[ (field, 'f8') for field in spacings + ('length', 'width') ])
+    for field in table.dtype.names:
+        table[field] = [ row[field] for row in rows ]
+    start = time.perf_counter()
+    convert_table(table, 'mm', 'ft', lengths=table.dtype.names, digits=2)
+    array = time.perf_counter() - start
+    print(f"{records} records mm->ft: per record {single:.3f}s records {batch:.3f}s structured array {array:.4f}s")
+
+
+if __name__ == '__main__':
+    bench_units()
@@ -3,6 +3,14 @@ import asyncio
 #from pycal import Water
 from modules.estimator.schema import WallSchema, RebarSchema
 from modules.estimator.slab import lib, logging
+try:
+    from units import convert_record
+except:
+    from modules.Estimate.units import convert_record
+
+
+REBAR_LENGTHS:tuple = ('vb_spacing', 'hb_spacing', 'vb_height', 'hb_length')
+REBAR_BARS:tuple = ('vb', 'hb')
 
 class Wall:
     def __init__(self, data:dict=None):
@@ -40,42 +48,14 @@ class Wall:
     async def process_rebars(self):
         unit = self.usys.get('length')
         try:
-            if unit == self.rebar.unit:
-                pass
-            elif unit == "m" and self.rebar.unit== 'mm':
-                factor = 1000
-                self.rebar.unit = "m"
-                self.rebar.vb_spacing = round(self.rebar.vb_spacing / factor,2)
-                self.rebar.hb_spacing = round(self.rebar.hb_spacing / factor,2)
-                self.rebar.vb_height = round(self.rebar.vb_height / factor,2)
-                self.rebar.hb_length = round(self.rebar.hb_length / factor,2)                
-            elif unit == "m" and self.rebar.unit== 'ft':
-                factor = 0.3048
-                self.rebar.unit = "m"
-                self.rebar.vb_spacing = round(self.rebar.vb_spacing * factor,2)
-                self.rebar.hb_spacing = round(self.rebar.hb_spacing * factor,2)
-                self.rebar.vb_height = round(self.rebar.vb_height * factor,2)
-                self.rebar.hb_length = round(self.rebar.hb_length * factor,2)                
-                self.rebar.vb = await lib.convert_bar(self.rebar.vb)
-                self.rebar.hb = await lib.convert_bar(self.rebar.hb)
-            elif unit == "ft" and self.rebar.unit== 'mm':
-                factor = 304.8
-                self.rebar.unit = "ft"
-                self.rebar.vb_spacing = round(self.rebar.vb_spacing / factor,2)
-                self.rebar.hb_spacing = round(self.rebar.hb_spacing / factor,2)
-                self.rebar.vb_height = round(self.rebar.vb_height / factor,2)
-                self.rebar.hb_length = round(self.rebar.hb_length / factor,2)
-                self.rebar.vb = await lib.convert_bar(self.rebar.vb)
-                self.rebar.hb = await lib.convert_bar(self.rebar.hb) 
-            elif unit == "ft" and self.rebar.unit== 'm':
-                factor = 3.048
-                self.rebar.unit = "ft"
-                self.rebar.vb_spacing = round(self.rebar.vb_spacing * factor,2)
-                self.rebar.hb_spacing = round(self.rebar.hb_spacing * factor,2)
-                self.rebar.vb_height = round(self.rebar.vb_height * factor,2)
-                self.rebar.hb_length = round(self.rebar.hb_length * factor,2)                
-                self.rebar.vb = await lib.convert_bar(self.rebar.vb)
-                self.rebar.hb = await lib.convert_bar(self.rebar.hb)
+            if unit != self.rebar.unit:
+                converted = convert_record(
+                    self.rebar, self.rebar.unit, unit,
+                    lengths=REBAR_LENGTHS, bars=REBAR_BARS, digits=2
+                    )
+                for field, value in converted.items():
+                    setattr(self.rebar, field, value)
+                self.rebar.unit = unit
         except Exception as e:
             logging.warning(e)        
   
@@ -83,20 +63,13 @@ class Wall:
     @property
     def to_meter(self):
         unit = self.data.unit
-        if unit == 'mm':
-            factor = 1000
-            self.data.length = self.data.length / factor
-            self.data.height = self.data.height / factor
-            self.data.thickness = self.data.thickness / factor            
-            self.set_unit_system('m') 
-            logging.info("Measurement system Converted from millimeters to meters." )         
-        elif unit == 'ft':
-            factor = 0.304
-            self.data.length = self.data.length * factor
-            self.data.height = self.data.height * factor
-            self.data.thickness = self.data.thickness * factor                      
+        if unit in ('mm', 'ft'):
+            converted = convert_record(self.data, unit, 'm', lengths=('length', 'height', 'thickness'))
+            for field, value in converted.items():
+                setattr(self.data, field, value)
+            self.data.unit = 'm'
             self.set_unit_system('m')
-            logging.info("Measurement system Converted from feet to meters." )  
+            logging.info(f"Measurement system Converted from {unit} to meters." )
         else:
             self.set_unit_system('m')    
 
@@ -117,7 +90,7 @@ class Wall:
     @property
     async def generate_report(self):
         await self.process_materials
-        concrete = await lib.get_resource(f'structure-grades-{self.data.concrete.lower()}') 
+        concrete = await lib.get_resource(f'structure-grades-{self.data.concrete.lower()}', copy=True) 
         
         self.report = {
             "title": f"Structural Engineering Report for Building Wall {self.data.tag}",
@@ -0,0 +1,140 @@
+# wallbatch.py
+import numpy as np
+
+try:
+    from catalog import catalog
+    from units import LENGTH_UNITS, METRES, SI
+except:
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.units import LENGTH_UNITS, METRES, SI
+
+
+WALL_DTYPE = np.dtype([
+    ('thickness', 'f8'), ('length', 'f8'), ('height', 'f8'),
+    ('v_type', 'i2'), ('v_spacing', 'f8'), ('h_type', 'i2'), ('h_spacing', 'f8')
+])
+OPENING_DTYPE = np.dtype([
+    ('wall', 'i4'), ('window', '?'), ('width', 'f8'), ('height', 'f8'), ('amt', 'i4'), ('x', 'f8'), ('sill', 'f8')
+]) # x and sill are nan when the opening has no position
+CMU_AREA = 0.08 # m2 block face used when cmulib has no block for a wall thickness
+
+
+def metres(unit:str=None):
+    return METRES[LENGTH_UNITS.index(catalog.units(unit or SI).get('length'))]
+
+
+def is_window(tag:str=None):
+    ''' Same rule as WallOpening.jamb.'''
+    return 'W' in tag or 'w' in tag or 'window' in tag
+
+
+def wall_tables(walls:list=None, openings:list=None):
+    ''' Packs wall data dicts and their openings into SI tables linked by wall index.
+        Openings may be nested in each wall as in walls.Wall data, or given as a
+        separate list linked by wall_tag, windows are told from doors by tag here.
+        Returns the wall table, the opening table ordered by wall, the offsets of
+        each wall's openings and the list of wall tags.
+    '''
+    table = np.zeros(len(walls), dtype=WALL_DTYPE)
+    index = {}
+    rows = []
+    bar_ids = catalog.bar_ids
+    for i, wall in enumerate(walls):
+        unit = wall.get('unit')
+        scale = metres(unit)
+        v, h = wall['rebars']['v'], wall['rebars']['h']
+        table[i] = (
+            wall['thickness'] * scale, wall['length'] * scale, wall['height'] * scale,
+            bar_ids[v['type']], v['spacing'] * metres(v.get('unit') or unit),
+            bar_ids[h['type']], h['spacing'] * metres(h.get('unit') or unit)
+        )
+        index[wall['tag']] = i
+        for opening in wall.get('openings', []):
+            rows.append((i, opening, unit))
+    for opening in openings or []:
+        i = index[opening['wall_tag']]
+        rows.append((i, opening, walls[i].get('unit')))
+    rows.sort(key=lambda row: row[0]) # stable, keeps each wall's openings in order
+    opening_table = np.zeros(len(rows), dtype=OPENING_DTYPE)
+    for j, (i, opening, unit) in enumerate(rows):
+        scale = metres(opening.get('unit') or unit)
+        x, sill = opening.get('x'), opening.get('sill')
+        opening_table[j] = (
+            i, is_window(opening['tag']), opening['width'] * scale, opening['height'] * scale, opening['amt'],
+            np.nan if x is None else x * scale, np.nan if sill is None else sill * scale
+        )
+    offsets = np.zeros(len(walls) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(opening_table['wall'], minlength=len(walls)), out=offsets[1:])
+    return table, opening_table, offsets, [ wall['tag'] for wall in walls ]
+
+
+def block_areas(thickness=None):
+    ''' Block face area from cmulib for each wall thickness in m.'''
+    cmulib = catalog.cmulib
+    sizes = { round(float(key)): block.get('area').get('value') for key, block in cmulib.items() if key.isdigit() }
+    return np.array([ sizes.get(round(value * 1000), CMU_AREA) for value in thickness.tolist() ])
+
+
+def wall_takeoff(walls=None, openings=None, tags:list=None):
+    ''' Takeoff of every wall in one pass over the wall and opening tables, SI units.
+        Matches walls.Wall: net area, openings area, block count, rough cast and
+        render (both faces), jamb length and vertical / horizontal bar quantities.
+    '''
+    count = len(walls)
+    area = ( openings['width'] * openings['height'] ) * openings['amt']
+    jamb = np.where(openings['window'], ( openings['width'] * 2 ) + ( openings['height'] * 2 ), openings['width'] + ( openings['height'] * 2 )) * openings['amt']
+    openings_area = np.bincount(openings['wall'], weights=area, minlength=count)
+    jamb_length = np.bincount(openings['wall'], weights=jamb, minlength=count)
+    net_area = (walls['length'] * walls['height']) - openings_area
+    arrays = catalog.bar_arrays
+    v_amt = np.round(walls['length'] / walls['v_spacing']).astype(int)
+    h_amt = np.round(walls['height'] / walls['h_spacing']).astype(int)
+    v_total = walls['height'] * v_amt
+    h_total = walls['length'] * h_amt
+    return {
+        "tag": tags,
+        "net_area": net_area,
+        "openings_area": openings_area,
+        "blocks": np.round(net_area / block_areas(walls['thickness'])).astype(int),
+        "rough_cast": net_area * 2,
+        "render": net_area * 2,
+        "jamb_length": jamb_length,
+        "vertical_amt": v_amt,
+        "vertical_rebars": np.round(v_total / arrays['length_m'][walls['v_type']]).astype(int),
+        "vertical_weight": np.round(v_total * arrays['kg_per_m'][walls['v_type']], 3),
+        "horizontal_amt": h_amt,
+        "horizontal_rebars": np.round(h_total / arrays['length_m'][walls['h_type']]).astype(int),
+        "horizontal_weight": np.round(h_total * arrays['kg_per_m'][walls['h_type']], 3),
+    }
+
+
+def bench_wallbatch(walls:int=2000, openings:int=5):
+    import time
+    try:
+        from walls import Wall, data
+    except:
+        from modules.Estimate.walls import Wall, data
+    rng = np.random.default_rng(1)
+    rows = [
+        dict(data, tag=f"W{i}", length=float(rng.uniform(3, 30)), height=float(rng.uniform(2.4, 4.5)), thickness=[0.1, 0.15, 0.2][i % 3],
+             openings=[ {'tag': f"{'window' if j % 2 else 'door'}-{j}", "width": float(rng.uniform(.5, 1.2)), "height": float(rng.uniform(.5, 2.1)), "amt": 1, 'unit': 'm'}
+                        for j in range(openings) ])
+        for i in range(walls)
+    ]
+    start = time.perf_counter()
+    objects = [ Wall(row) for row in rows ]
+    single = [ (wall.net_area, wall.blocks['value'], wall.jamb_length) for wall in objects ]
+    each = time.perf_counter() - start
+    start = time.perf_counter()
+    tables = wall_tables(rows)
+    packed = time.perf_counter() - start
+    start = time.perf_counter()
+    takeoff = wall_takeoff(tables[0], tables[1], tables[3])
+    batch = time.perf_counter() - start
+    assert np.allclose([ s[0] for s in single ], takeoff['net_area'])
+    assert [ s[1] for s in single ] == takeoff['blocks'].tolist()
+    print(f"{walls} walls, {walls * openings} openings: objects {each:.3f}s, tables {packed:.3f}s + batch takeoff {batch:.4f}s")
+
+
+if __name__ == '__main__':
+    bench_wallbatch()
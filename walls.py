@@ -1,10 +1,21 @@
 # walls 
-from pydantic import BaseModel
+from typing import ClassVar
+from pydantic import BaseModel, ConfigDict
 
 try:
-    from elibrary import Library
+    from catalog import catalog
+    from units import SI, to_si, si_record, present, present_record, present_weight
+    from memo import cached, state
+    from splice import splice
+    from records import BarGroup
+    from masonry import wall_layout
 except:
-    from modules.Estimate.elibrary import Library
+    from modules.Estimate.catalog import catalog
+    from modules.Estimate.units import SI, to_si, si_record, present, present_record, present_weight
+    from modules.Estimate.memo import cached, state
+    from modules.Estimate.splice import splice
+    from modules.Estimate.records import BarGroup
+    from modules.Estimate.masonry import wall_layout
 
 # DAta sources
 rebars = {
@@ -29,6 +40,7 @@ data = {
     }
 
 class Rebar(BaseModel):
+    lengths:ClassVar[tuple] = ('spacing', 'length')
     type:str
     unit:str
     spacing:float    
@@ -37,39 +49,45 @@ class Rebar(BaseModel):
     
     @property
     def data(self):
-        return Library().rebarnotes.get(self.type)    
+        return catalog.rebarnotes.get(self.type)    
     
     @property
     def cut_length(self):
-        if float(self.length) < 9.0:
+        stock = catalog.bar(self.type).length_m
+        if float(self.length) < stock:
             return { "value": float(self.length), "unit": self.unit }
         else:
-            return { "value": 9.0, "unit": self.unit }
+            return { "value": stock, "unit": self.unit }
+
+    @property
+    def spliced(self):
+        ''' Segments, laps, lapped length and weight of the run, see splice.splice.'''
+        return { key: value[0].item() for key, value in splice([self.length], [self.amt], [self.type]).items() }
 
 
     @property
     def bars(self):
-        if self.unit == 'm':
-            bar_length = self.data.get('standard_length').get('metric').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('metric').get('value')
-            weight_per_unit = 'kg'
-
-        else:
-            bar_length = self.data.get('standard_length').get('imperial').get('value')
-            bar_weight_per_unit = self.data.get('weight').get('imperial').get('value')
-            weight_per_unit = 'lb'
+        bar = catalog.bar(self.type)
+        bar_length, bar_weight_per_unit, weight_per_unit = bar.system(SI)
         
         return {
-            'rebars': { "type": f"{self.type} ( {self.data.get('insize')}inch )", "value": round((self.length * self.amt ) / bar_length), "unit": "length"},
+            'rebars': { "type": bar.label, "value": round((self.length * self.amt ) / bar_length), "unit": "length"},
             'weight': { "value": round((self.length * self.amt ) * bar_weight_per_unit, 3), "unit": weight_per_unit }            
 
         }
 
+    def present(self, unit:str=SI):
+        ''' bars with the weight in the caller's unit system, lb for ft callers.'''
+        group = self.bars
+        group['weight'] = present_weight(group['weight']['value'], unit)
+        return group
+
 
     
 
 
 class BlockWall(BaseModel):
+    lengths:ClassVar[tuple] = ('thickness', 'length', 'height')
     tag:str
     thickness:float
     length:float
@@ -82,12 +100,16 @@ class BlockWall(BaseModel):
 
 
 class WallOpening(BaseModel):
+    model_config = ConfigDict(frozen=True) # the wall keeps running totals of its openings, edits go through Wall.update_opening
+    lengths:ClassVar[tuple] = ('width', 'height', 'x', 'sill')
     wall_tag:str | None = None
     tag:str    
     width:float
     height:float
     amt:int
     unit:str = "m"
+    x:float | None = None # distance of the left edge from the wall start for a single opening (amt 1), placed by the block layout when None
+    sill:float | None = None # height of the bottom edge above the wall base
 
     @property
     def area(self):
@@ -103,25 +125,27 @@ class WallOpening(BaseModel):
 
 
 class Wall:
+    category = 'wall'
     def __init__(self, data:dict=None):
         if data:
-            self.data=BlockWall( **data )
-            self.openings = [ WallOpening( **item ) for item in data.get('openings', []) ]            
-            self.set_unit_system(self.data.unit)
-            if self.units.get('length') == 'm':
-                self.cmu = {
-                    "length": {"unit": 'm', "value": 0.4},
-                    "depth": {"unit": 'm', "value": 0.2}
-                }
-            else:
-                self.cmu = {
-                    "length": {"unit": 'ft', "value": 1.33},
-                    "depth": {"unit": 'ft', "value": 0.667}
-                }
+            self.set_unit_system(data.get('unit'))
+            self.data = to_si(BlockWall, data, self.unit)
+            self.opening_index = {} # openings by internal id, in the order added
+            self.opening_ids = {} # internal ids of the openings of each tag, tags may repeat
+            self.next_opening = 0
+            self.openings_area = 0 # running totals in SI units, kept by the opening methods
+            self.jamb_length = 0
+            self.version = 0
+            for item in data.get('openings', []):
+                self.add_opening(item)
+            self.cmu = {
+                "length": {"unit": 'm', "value": 0.4},
+                "depth": {"unit": 'm', "value": 0.2}
+            }
             self.cmu['area'] = round(self.cmu.get('length').get('value') * self.cmu.get('depth').get('value'),3)
             self.rebars = {
-                "vertical": Rebar( **data.get('rebars').get('v')),
-                "horizontal": Rebar( **data.get('rebars').get('h'))
+                "vertical": to_si(Rebar, data.get('rebars').get('v'), self.unit),
+                "horizontal": to_si(Rebar, data.get('rebars').get('h'), self.unit)
             }
             self.rebars['vertical'].length =  self.data.height
             self.rebars['horizontal'].length =  self.data.length
@@ -130,7 +154,83 @@ class Wall:
 
     def set_unit_system(self, unit): 
         ''' Establish or convert the system of measurement units'''       
-        self.units = Library().set_unit_system(unit)
+        self.unit = unit or SI
+        self.units = catalog.units(self.unit)
+
+    @property
+    def openings(self):
+        return list(self.opening_index.values())
+
+    def add_opening(self, data:dict=None):
+        ''' Adds an opening given in the wall's unit system, updating the running totals.
+            Returns the opening's internal id.
+        '''
+        opening = to_si(WallOpening, data, self.unit)
+        key = self.next_opening
+        self.next_opening += 1
+        self.opening_index[key] = opening
+        self.opening_ids.setdefault(opening.tag, []).append(key)
+        self.openings_area += opening.area
+        self.jamb_length += opening.jamb
+        self.version += 1
+        return key
+
+    def opening_key(self, key=None):
+        ''' Internal id of an opening given by id or by tag, the first opening added with a repeated tag.'''
+        if isinstance(key, int) and key in self.opening_index:
+            return key
+        ids = self.opening_ids.get(key)
+        if not ids:
+            raise KeyError(key)
+        return ids[0]
+
+    def remove_opening(self, key=None):
+        ''' Removes an opening by id or tag, updating the running totals.'''
+        key = self.opening_key(key)
+        opening = self.opening_index.pop(key)
+        self.opening_ids[opening.tag].remove(key)
+        if not self.opening_ids[opening.tag]:
+            del self.opening_ids[opening.tag]
+        self.openings_area -= opening.area
+        self.jamb_length -= opening.jamb
+        if not self.opening_index: # no rounding residue once the wall is bare
+            self.openings_area = 0
+            self.jamb_length = 0
+        self.version += 1
+        return opening
+
+    def update_opening(self, key=None, **changes):
+        ''' Edits the fields of an opening given by id or tag, lengths in the wall's unit system.'''
+        key = self.opening_key(key)
+        opening = self.opening_index[key]
+        changed = WallOpening( **dict(opening.model_dump(), **si_record(WallOpening, changes, self.unit)) )
+        if changed.tag != opening.tag:
+            self.opening_ids[opening.tag].remove(key)
+            if not self.opening_ids[opening.tag]:
+                del self.opening_ids[opening.tag]
+            self.opening_ids.setdefault(changed.tag, []).append(key)
+        self.opening_index[key] = changed
+        self.openings_area += changed.area - opening.area
+        self.jamb_length += changed.jamb - opening.jamb
+        self.version += 1
+        return changed
+
+    def specs(self):
+        ''' Openings and rebar specs the wall quantities depend on.'''
+        return [self.openings, self.rebars.get('vertical'), self.rebars.get('horizontal')]
+
+    def inputs(self):
+        ''' Snapshot of the wall and rebar specs the cached report depends on,
+            openings are represented by the version the opening methods advance.
+        '''
+        return state(self.unit, self.data, self.version, self.rebars.get('vertical'), self.rebars.get('horizontal'))
+
+    def bar_groups(self):
+        ''' Vertical and horizontal wall bars as BarGroup tuples.'''
+        return [
+            BarGroup(mark, rebar.type, 'straight', rebar.length, rebar.amt)
+            for mark, rebar in self.rebars.items()
+        ]
 
     @property
     def tag(self):
@@ -138,62 +238,63 @@ class Wall:
 
     @property
     def length(self):
-        return {
-            "value": self.data.length,
-            "unit": self.units.get('length')
-        }
+        return present(self.data.length, 'length', self.unit)
     
     @property
     def height(self):
-        return {
-            "value": self.data.height,
-            "unit": self.units.get('length')
-        }
-        
+        return present(self.data.height, 'length', self.unit)
+
+    @property
+    def net_area(self):
+        ''' Wall area less openings in m2 '''
+        return (self.data.length * self.data.height) - self.openings_area
     
     @property
     def area(self):
-        return {
-            "value": (self.data.length * self.data.height) - sum([ opening.area for opening in self.openings ]),
-            "unit": self.units.get('area')
-        }
+        return present(self.net_area, 'area', self.unit)
     
 
     @property 
     def blocks(self):
         
         return {
-            "value": round(self.area.get('value') / self.cmu.get('area')),
+            "value": round(self.net_area / self.cmu.get('area')),
             "unit": 'Each'
         }
     
+    @cached
+    def block_layout(self):
+        ''' Courses and full, half and cut blocks of the running bond layout.'''
+        return wall_layout(self)
+
     @property 
     def rough_cast(self):        
-        return {
-            "value": self.area.get('value') * 2,
-            "unit": self.units.get('area')
-        }
+        return present(self.net_area * 2, 'area', self.unit)
     
 
     @property 
     def render(self):        
-        return {
-            "value": self.area.get('value') * 2,
-            "unit": self.units.get('area')
-        }
+        return present(self.net_area * 2, 'area', self.unit)
     
     @property
     def cut_out(self):
-        return {
-            "value": sum([ opening.area for opening in self.openings ]),
-            "unit": self.units.get('area')
-        }
+        return present(self.openings_area, 'area', self.unit)
     
     @property
     def flat_jamb(self):
+        return present(self.jamb_length, 'length', self.unit, 2)
+
+    @cached
+    def report(self):
         return {
-            "value": round(sum([ opening.jamb for opening in self.openings ]),2),
-            "unit": self.units.get('length')
+            "wall": present_record(BlockWall, self.data.model_dump(), self.unit),
+            "area": self.area,
+            "blocks": self.blocks,
+            "rough_cast": self.rough_cast,
+            "render": self.render,
+            "cut_out": self.cut_out,
+            "flat_jamb": self.flat_jamb,
+            "rebars": { mark: rebar.present(self.unit) for mark, rebar in self.rebars.items() }
         }
     
 
@@ -202,4 +303,22 @@ def Test():
     wall = Wall( data=data )
     print(wall.rebars.get('vertical').bars)
 
-#Test()
\ No newline at end of file
+#Test()
+
+
+def bench_wall_aggregates(openings:int=10_000, reads:int=10_000):
+    import time
+    wall = Wall(dict(data, openings=[ {'tag': f"window-{i}", "width": .6, "height": .6, "amt": 1, 'unit': 'm'} for i in range(openings) ]))
+    start = time.perf_counter()
+    for _ in range(reads):
+        wall.area, wall.blocks, wall.rough_cast, wall.render, wall.cut_out, wall.flat_jamb
+    summary = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(reads):
+        wall.update_opening(f"window-{i % openings}", width=.9)
+    edits = time.perf_counter() - start
+    print(f"wall with {openings} openings: summary read {summary / reads * 1e6:.1f}us, opening edit {edits / reads * 1e6:.1f}us")
+
+
+if __name__ == '__main__':
+    bench_wall_aggregates()